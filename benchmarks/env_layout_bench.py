@@ -0,0 +1,46 @@
+# benchmarks/env_layout_bench.py
+#
+# 환경 마스크 → 클래스별 비율 / 공간 격자 계산 비용 측정
+#
+#   python -m benchmarks.env_layout_bench --instances 5,20,60 --classes 6
+
+import argparse
+import timeit
+
+import numpy as np
+
+from models.env_segmenter import LAYOUT_STRIDE, pool_class_layout
+
+
+def build_masks(rng, n, n_classes, h, w):
+    masks = np.zeros((n, h, w), dtype=bool)
+    for i in range(n):
+        y0, x0 = rng.integers(0, h // 2), rng.integers(0, w // 2)
+        masks[i, y0:y0 + rng.integers(h // 8, h // 2), x0:x0 + rng.integers(w // 8, w // 2)] = True
+    return masks, rng.integers(0, n_classes, size=n)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--instances", type=str, default="5,20,60", help="프레임당 마스크 수 목록")
+    parser.add_argument("--classes", type=int, default=6)
+    parser.add_argument("--mask-h", type=int, default=384, help="모델 입력 해상도 (letterbox)")
+    parser.add_argument("--mask-w", type=int, default=640)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"[env_layout_bench] mask={args.mask_h}x{args.mask_w} stride={LAYOUT_STRIDE}")
+
+    for n in (int(x) for x in args.instances.split(",")):
+        full, class_ids = build_masks(rng, n, args.classes, args.mask_h, args.mask_w)
+        masks = full[:, ::LAYOUT_STRIDE, ::LAYOUT_STRIDE]
+
+        times = timeit.repeat(lambda: pool_class_layout(masks, class_ids), number=1, repeat=args.repeat)
+        p50, p95 = np.percentile(np.array(times) * 1000, [50, 95])
+        print(f"instances={n:<4} p50={p50:7.3f}ms  p95={p95:7.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# benchmarks/intent_bench.py
+#
+# intent 매칭 micro-benchmark
+#   기존 순차 substring 검사(legacy) vs 컴파일된 Aho-Corasick 매처
+#
+#   python -m benchmarks.intent_bench --samples 20000
+
+import argparse
+import random
+import timeit
+
+from core.intent import INTENT_RULES, JUNK_WORDS, normalize_command, score_command
+
+FILLERS = ("", " ", "좀 ", "지금 ", "요", "해줘", "해주세요", "알려줘", "인가요?", "어", "음 ", "그", "나")
+
+
+# ------------------------
+# 기존 구현 (동일 결과 검증용 기준)
+# ------------------------
+def legacy_normalize_text(text: str) -> str:
+    t = text.strip().lower().replace(" ", "")
+
+    junk_words = [
+        "좀", "조금", "약간", "그냥", "이제", "지금", "요", "요?", "요.",
+        "거야", "거지", "인가요", "인가요?", "인가",
+        "해주세요", "해줘", "해주세요요", "좀요",
+    ]
+
+    for j in junk_words:
+        t = t.replace(j, "")
+
+    return t
+
+
+def legacy_normalize_command(text: str) -> dict:
+    norm = legacy_normalize_text(text)
+
+    def has(*words):
+        return any(w in norm for w in words)
+
+    if has("시작", "실행", "가동", "켜"):
+        return {"intent": "system_start", "raw": text, "norm": norm}
+
+    if has("종료", "끝내", "꺼", "중지", "멈춰"):
+        return {"intent": "system_stop", "raw": text, "norm": norm}
+
+    if has("객체", "물체", "뭐있어", "위험한거", "위험한게", "주변뭐", "사람있어", "차있어"):
+        return {"intent": "object_guide", "raw": text, "norm": norm}
+
+    if has("위험환경", "위험한곳", "위험해", "조심", "조심할"):
+        return {"intent": "env_danger", "raw": text, "norm": norm}
+
+    if has("안전환경", "안전해", "안전한곳"):
+        return {"intent": "env_safe", "raw": text, "norm": norm}
+
+    if has("환경안내", "환경메뉴", "주변환경"):
+        return {"intent": "env_menu", "raw": text, "norm": norm}
+
+    if has("경고꺼", "경고그만", "조용히", "그만말해", "알람꺼", "mute"):
+        return {"intent": "env_alert_off", "raw": text, "norm": norm}
+
+    if has("경고켜", "알람켜", "다시알려줘", "다시경고", "경고재개"):
+        return {"intent": "env_alert_on", "raw": text, "norm": norm}
+
+    if has("위치메뉴", "위치안내"):
+        return {"intent": "location_menu", "raw": text, "norm": norm}
+
+    if has("여기어디", "지금어디", "내위치", "현재위치"):
+        return {"intent": "location_summary", "raw": text, "norm": norm}
+
+    if has("주소", "지번"):
+        return {"intent": "location_address", "raw": text, "norm": norm}
+
+    if has("주변건물", "건물", "무슨건물"):
+        return {"intent": "location_landmark", "raw": text, "norm": norm}
+
+    if has("편의시설", "생활시설", "시설", "병원", "약국", "마트", "편의점", "지하철", "역"):
+        return {"intent": "location_facility", "raw": text, "norm": norm}
+
+    if has("천천히", "느리게"):
+        return {"intent": "tts_slow", "raw": text, "norm": norm}
+
+    if has("빨리", "빠르게"):
+        return {"intent": "tts_fast", "raw": text, "norm": norm}
+
+    if has("보통속도", "기본속도", "원래대로"):
+        return {"intent": "tts_normal", "raw": text, "norm": norm}
+
+    if has("뒤로", "뒤로가기", "메인", "처음"):
+        return {"intent": "ui_back", "raw": text, "norm": norm}
+
+    if has("사진", "이미지", "찍어", "분석"):
+        return {"intent": "upload_image", "raw": text, "norm": norm}
+
+    if has("다시말해", "다시", "한번더"):
+        return {"intent": "repeat_last", "raw": text, "norm": norm}
+
+    return {"intent": "unknown", "raw": text, "norm": norm}
+
+
+def build_corpus(n, seed):
+    rng = random.Random(seed)
+    keywords = [kw for _, kws in INTENT_RULES for kw in kws]
+    pieces = keywords + list(JUNK_WORDS) + list(FILLERS)
+
+    corpus = []
+    for _ in range(n):
+        k = rng.randint(1, 4)
+        corpus.append(" ".join(rng.choice(pieces) for _ in range(k)))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.samples, args.seed)
+
+    mismatches = [
+        t for t in corpus
+        if legacy_normalize_command(t) != normalize_command(t)
+    ]
+    print(f"[intent_bench] samples={len(corpus)} mismatches={len(mismatches)}")
+    for t in mismatches[:10]:
+        print(f"  {t!r}: {legacy_normalize_command(t)['intent']} != {normalize_command(t)['intent']}")
+
+    for name, fn in (
+        ("legacy", legacy_normalize_command),
+        ("compiled", normalize_command),
+        ("compiled+score", score_command),
+    ):
+        best = min(timeit.repeat(lambda: [fn(t) for t in corpus], number=1, repeat=args.repeat))
+        print(f"{name:<15} {best * 1e6 / len(corpus):7.2f} us/utterance")
+
+    ambiguous = sorted(
+        (score_command(t) for t in set(corpus)),
+        key=lambda r: r["confidence"]
+    )
+    ambiguous = [r for r in ambiguous if r["intent"] != "unknown" and r["confidence"] < 0.5]
+    print(f"ambiguous (confidence < 0.5): {len(ambiguous)}")
+    for r in ambiguous[:5]:
+        print(f"  {r['raw']!r} -> {r['intent']} ({r['confidence']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/kakao_fixture_server.py
+#
+# 기록된 Kakao 응답(fixture)을 제공하는 로컬 대체 서버
+#
+#   1) 실제 응답 기록
+#      KAKAO_RECORD_DIR=fixtures/kakao uvicorn main:app ...
+#   2) 대체 서버 실행
+#      python -m benchmarks.kakao_fixture_server --fixtures fixtures/kakao --latency-ms 80 --error-rate 0.02
+#   3) 서버를 대체 서버로 연결
+#      KAKAO_BASE_URL=http://127.0.0.1:8081/v2/local KAKAO_REST_API_KEY=dummy uvicorn main:app ...
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from core.kakao_fixtures import fixture_key, iter_fixtures
+
+PATH_PREFIX = "/v2/local"
+
+
+def build_handler(table, latency_ms, jitter_ms, error_rate):
+    stats = {"served": 0, "missing": 0, "errors": 0}
+    lock = threading.Lock()
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+
+            if url.path == "/_stats":
+                with lock:
+                    return self._send(200, dict(stats))
+
+            path = url.path
+            if path.startswith(PATH_PREFIX):
+                path = path[len(PATH_PREFIX):]
+            params = dict(parse_qsl(url.query))
+
+            delay = latency_ms + random.uniform(-jitter_ms, jitter_ms)
+            if delay > 0:
+                time.sleep(delay / 1000)
+
+            if random.random() < error_rate:
+                with lock:
+                    stats["errors"] += 1
+                return self._send(500, {"errorType": "InjectedError"})
+
+            body = table.get(fixture_key(path, params))
+            with lock:
+                if body is None:
+                    stats["missing"] += 1
+                else:
+                    stats["served"] += 1
+
+            if body is None:
+                return self._send(200, {"documents": [], "meta": {"total_count": 0}})
+            return self._send(200, body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return FixtureHandler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", type=str, required=True, help="KAKAO_RECORD_DIR로 기록한 디렉토리")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="응답 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="지연 변동폭 (±ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="HTTP 500 주입 비율 (0~1)")
+    args = parser.parse_args()
+
+    table = {fixture_key(path, params): resp for path, params, resp in iter_fixtures(args.fixtures)}
+    print(f"[fixture_server] {len(table)} fixtures loaded from {args.fixtures}")
+
+    handler = build_handler(table, args.latency_ms, args.jitter_ms, args.error_rate)
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"[fixture_server] http://{args.host}:{args.port}{PATH_PREFIX}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
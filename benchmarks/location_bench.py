@@ -0,0 +1,215 @@
+# benchmarks/location_bench.py
+#
+# /api/identity 지연시간 벤치마크
+#
+#   python -m benchmarks.location_bench --server http://127.0.0.1:8000 \
+#       --fixtures fixtures/kakao --concurrency 16 --requests 200
+#
+#   --launch 지정 시 Kakao 호출 예산을 해제한 서버를 직접 실행 (임시 쿼터 DB)
+#       → 측정값이 토큰 버킷 제한 / 캐시 대체가 아닌 엔드포인트 지연을 반영
+#
+#   python -m benchmarks.location_bench --launch --kakao-base-url http://127.0.0.1:8081/v2/local \
+#       --fixtures fixtures/kakao --concurrency 16 --requests 200
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+import requests
+
+from core.kakao_fixtures import iter_fixtures
+
+ENDPOINTS = ("summary", "address", "landmark", "facility")
+
+# /api/identity/quota 카운터 중 벤치마크 결과 해석에 필요한 항목
+QUOTA_COUNTERS = ("upstream", "throttled", "cache_fallback", "coalesced")
+
+# --launch 서버의 Kakao 호출 예산 (사실상 무제한)
+UNLIMITED_QUOTA_ENV = {
+    "KAKAO_RATE_PER_SEC": "1000000",
+    "KAKAO_RATE_BURST": "1000000",
+    "KAKAO_DAILY_LIMIT": "1000000000",
+}
+
+LAUNCH_TIMEOUT_SEC = 60.0
+
+
+def load_positions(args):
+    if args.positions:
+        out = []
+        for item in args.positions.split(";"):
+            lat, lng = item.split(",")
+            out.append((float(lat), float(lng)))
+        return out
+
+    # 기록된 역지오코딩 요청 좌표 재사용
+    out = []
+    for path, params, _ in iter_fixtures(args.fixtures):
+        if path.endswith("coord2address.json"):
+            out.append((float(params["y"]), float(params["x"])))
+    return out
+
+
+def run_one(session, server, endpoint, lat, lng, category, session_id):
+    body = {"lat": lat, "lng": lng}
+    if session_id:
+        body["session_id"] = session_id
+    if endpoint == "facility":
+        body["category_code"] = category
+
+    t0 = time.perf_counter()
+    try:
+        r = session.post(f"{server}/api/identity/{endpoint}", json=body, timeout=30)
+        ok = r.status_code == 200
+    except requests.RequestException:
+        ok = False
+    return (time.perf_counter() - t0) * 1000, ok
+
+
+def launch_server(args, workdir):
+    """Kakao 호출 예산을 해제하고 임시 쿼터 DB 를 쓰는 서버 실행"""
+    url = urlsplit(args.server)
+    env = dict(os.environ)
+    env.update(UNLIMITED_QUOTA_ENV)
+    env["KAKAO_QUOTA_DB"] = str(Path(workdir) / "kakao_quota.sqlite3")
+    env["KAKAO_BASE_URL"] = args.kakao_base_url
+    env.setdefault("KAKAO_REST_API_KEY", "dummy")
+
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", url.hostname or "127.0.0.1",
+            "--port", str(url.port or 8000),
+            "--log-level", "warning",
+        ],
+        env=env,
+    )
+
+    deadline = time.perf_counter() + LAUNCH_TIMEOUT_SEC
+    while time.perf_counter() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버 실행 실패 (exit={proc.returncode})")
+        try:
+            if requests.get(f"{args.server}/api/health", timeout=1).ok:
+                return proc
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+
+    proc.terminate()
+    raise RuntimeError("서버 실행 대기 시간 초과")
+
+
+def fetch_quota(server):
+    try:
+        r = requests.get(f"{server}/api/identity/quota", timeout=5)
+        return r.json() if r.ok else {}
+    except (requests.RequestException, ValueError):
+        return {}
+
+
+def counter_delta(before, after):
+    b = before.get("counters", {})
+    a = after.get("counters", {})
+    return {name: a.get(name, 0) - b.get(name, 0) for name in QUOTA_COUNTERS}
+
+
+def bench_endpoint(args, endpoint, positions):
+    sessions = [requests.Session() for _ in range(args.concurrency)]
+
+    def task(i):
+        lat, lng = random.choice(positions)
+        sid = f"bench-{i % args.concurrency}" if args.use_session else None
+        return run_one(
+            sessions[i % args.concurrency], args.server,
+            endpoint, lat, lng, args.category, sid
+        )
+
+    quota_before = fetch_quota(args.server)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(task, range(args.requests)))
+    wall = time.perf_counter() - t0
+
+    delta = counter_delta(quota_before, fetch_quota(args.server))
+
+    lat_ms = np.array([ms for ms, ok in results if ok])
+    errors = sum(1 for _, ok in results if not ok)
+
+    if lat_ms.size:
+        p50, p95, p99 = np.percentile(lat_ms, [50, 95, 99])
+    else:
+        p50 = p95 = p99 = float("nan")
+
+    print(
+        f"{endpoint:<9} n={len(results):<5} err={errors:<4} "
+        f"rps={len(results) / wall:7.1f}  "
+        f"p50={p50:8.1f}ms  p95={p95:8.1f}ms  p99={p99:8.1f}ms  "
+        f"kakao: upstream={delta['upstream']} throttled={delta['throttled']} "
+        f"cache={delta['cache_fallback']} coalesced={delta['coalesced']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--server", type=str, default="http://127.0.0.1:8000")
+    parser.add_argument("--fixtures", type=str, default=None, help="좌표 추출용 fixture 디렉토리")
+    parser.add_argument("--positions", type=str, default=None, help="'lat,lng;lat,lng' 직접 지정")
+    parser.add_argument("--endpoints", type=str, default=",".join(ENDPOINTS))
+    parser.add_argument("--category", type=str, default="HP8", help="facility 카테고리 코드")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="엔드포인트별 요청 수")
+    parser.add_argument("--use-session", action="store_true", help="session_id 전송 (위치 컨텍스트 재사용)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--launch", action="store_true", help="호출 예산을 해제한 서버를 직접 실행 (임시 쿼터 DB)")
+    parser.add_argument(
+        "--kakao-base-url", type=str, default="http://127.0.0.1:8081/v2/local",
+        help="--launch 서버가 사용할 Kakao (fixture 서버) 주소"
+    )
+    args = parser.parse_args()
+
+    if not args.fixtures and not args.positions:
+        parser.error("--fixtures 또는 --positions 중 하나가 필요합니다.")
+
+    random.seed(args.seed)
+    positions = load_positions(args)
+    if not positions:
+        parser.error("벤치마크에 사용할 좌표가 없습니다.")
+
+    workdir = tempfile.TemporaryDirectory(prefix="location_bench_") if args.launch else None
+    proc = launch_server(args, workdir.name) if workdir else None
+
+    try:
+        quota = fetch_quota(args.server)
+        print(
+            f"[location_bench] server={args.server} positions={len(positions)} "
+            f"concurrency={args.concurrency} requests={args.requests} "
+            f"kakao_rate={quota.get('rate_per_sec', '?')}/s"
+        )
+        if quota.get("rate_per_sec", float("inf")) < args.concurrency:
+            print(
+                "[location_bench] ⚠️ Kakao 호출 예산이 동시성보다 낮음 → 지연 분포에 제한 / 캐시 대체가 섞임 "
+                "(--launch 또는 KAKAO_RATE_PER_SEC / KAKAO_RATE_BURST 상향)"
+            )
+
+        for endpoint in args.endpoints.split(","):
+            bench_endpoint(args, endpoint.strip(), positions)
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=10)
+        if workdir:
+            workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/risk_bench.py
+#
+# 객체 위험도 계산 micro-benchmark
+#   객체별 compute_risk (scalar) vs RiskBatch (NumPy 일괄) vs compute_frame_risk (객체 수 기준 선택)
+#   각 경로는 /api/infer 처럼 객체별 위험도 / 접근 여부까지 읽는 전체 루프로 측정
+#
+#   python -m benchmarks.risk_bench --objects 1,5,10,20,30,50,100 --frames 2000
+
+import argparse
+import random
+import timeit
+
+from core.risk import CLASS_WEIGHTS, RISK_BATCH_MIN_OBJECTS, RiskBatch, compute_frame_risk, compute_risk
+
+CLASSES = tuple(CLASS_WEIGHTS) + ("person", "dog")
+
+
+def build_frame(rng, n, frame_w, frame_h):
+    objects = []
+    for i in range(n):
+        prev_h = rng.uniform(10, frame_h)
+        curr_h = prev_h * rng.uniform(0.9, 1.2)
+        prev_x = rng.uniform(0, frame_w)
+        curr_x = prev_x + rng.uniform(-20, 20)
+        objects.append({
+            "id": i,
+            "class": rng.choice(CLASSES),
+            "prev_h": prev_h,
+            "curr_h": curr_h,
+            "prev_center": (prev_x, frame_h / 2),
+            "curr_center": (curr_x, frame_h / 2),
+        })
+    return objects
+
+
+def scalar_frame(objects, frame_w):
+    out = []
+    for obj in objects:
+        state = {
+            "class": obj["class"],
+            "prev_h": obj["prev_h"],
+            "curr_h": obj["curr_h"],
+            "prev_center": obj["prev_center"],
+            "curr_center": obj["curr_center"],
+            "frame_w": frame_w,
+        }
+        out.append(compute_risk(state))
+    return out
+
+
+def batch_frame(objects, frame_w):
+    return RiskBatch.from_objects(objects).compute(frame_w)
+
+
+def consume(tracked, risk):
+    """/api/infer 와 같은 방식으로 객체별 값 읽기"""
+    scores = risk["risk_score"]
+    Da = risk["components"]["Da"]
+    Ad = risk["components"]["Ad"]
+    return [
+        (obj["id"], float(scores[i]), bool(Da[i] == 1.0 and Ad[i] > 0))
+        for i, obj in enumerate(tracked)
+    ]
+
+
+def scalar_loop(objects, frame_w):
+    return consume(*compute_frame_risk(objects, frame_w, min_batch=len(objects) + 1))
+
+
+def batch_loop(objects, frame_w):
+    return consume(*compute_frame_risk(objects, frame_w, min_batch=0))
+
+
+def auto_loop(objects, frame_w):
+    return consume(*compute_frame_risk(objects, frame_w))
+
+
+def count_mismatches(objects, frame_w):
+    scalar = scalar_frame(objects, frame_w)
+    batch = batch_frame(objects, frame_w)
+    bad = 0
+    for i, s in enumerate(scalar):
+        bad += s["risk_score"] != batch["risk_score"][i]
+        bad += any(v != batch["components"][k][i] for k, v in s["components"].items())
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=str, default="1,5,10,20,30,50,100", help="프레임당 객체 수 목록")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--frame-w", type=int, default=640)
+    parser.add_argument("--frame-h", type=int, default=360)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    for n in (int(x) for x in args.objects.split(",")):
+        frames = [build_frame(rng, n, args.frame_w, args.frame_h) for _ in range(args.frames)]
+        mismatches = sum(count_mismatches(f, args.frame_w) for f in frames)
+        mismatches += sum(
+            scalar_loop(f, args.frame_w) != batch_loop(f, args.frame_w) for f in frames
+        )
+
+        results = []
+        for fn in (scalar_loop, batch_loop, auto_loop):
+            best = min(timeit.repeat(
+                lambda: [fn(f, args.frame_w) for f in frames],
+                number=1, repeat=args.repeat
+            ))
+            results.append(best * 1e6 / len(frames))
+
+        print(
+            f"objects={n:<4} scalar={results[0]:8.1f}  batch={results[1]:8.1f}  "
+            f"auto={results[2]:8.1f} us/frame (full loop)  mismatches={mismatches}"
+        )
+
+    print(f"auto: RiskBatch 사용 기준 objects >= {RISK_BATCH_MIN_OBJECTS}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# benchmarks/stt_bench.py
+#
+# STT 백엔드 비교 (whisper vs faster_whisper)
+#
+#   python -m benchmarks.stt_bench --audio-dir recordings/commands \
+#       --labels recordings/commands/labels.csv --model-size base --compute-type int8
+#
+# labels.csv (선택): "파일명,intent" 형식
+
+import argparse
+import csv
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from core.stt import (
+    COMMAND_PROMPT,
+    STT_BACKENDS,
+    FasterWhisperBackend,
+    decode_audio,
+    normalize_command,
+)
+
+AUDIO_EXTENSIONS = {".webm", ".wav", ".mp3", ".m4a", ".ogg"}
+
+
+def load_labels(path):
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return {row[0]: row[1] for row in csv.reader(f) if len(row) >= 2}
+
+
+def build_backend(name, args, device):
+    kwargs = {"device": device, "beam_size": args.beam_size}
+    if name == FasterWhisperBackend.name:
+        kwargs["compute_type"] = args.compute_type
+    return STT_BACKENDS[name](args.model_size, **kwargs)
+
+
+def run_backend(name, args, files, audios, device):
+    t0 = time.perf_counter()
+    backend = build_backend(name, args, device)
+    load_ms = (time.perf_counter() - t0) * 1000
+
+    # warm-up 1회 (초기화 비용 제외)
+    backend.transcribe(np.zeros(16000, dtype=np.float32))
+
+    outputs = {}
+    latencies = []
+    for f in files:
+        t0 = time.perf_counter()
+        text = backend.transcribe(audios[f.name])
+        latencies.append((time.perf_counter() - t0) * 1000)
+        outputs[f.name] = normalize_command(text) if text else {"intent": "unknown", "raw": "", "norm": ""}
+
+    p50, p95 = np.percentile(latencies, [50, 95])
+    print(
+        f"{name:<15} load={load_ms:8.0f}ms  "
+        f"p50={p50:8.1f}ms  p95={p95:8.1f}ms  mean={np.mean(latencies):8.1f}ms"
+    )
+
+    # 빠른 경로 (명령 어휘 prompt + 토큰 제한): 지연 / 채택률 / 전체 디코딩과의 일치율
+    if args.fast_path:
+        fast_latencies = []
+        accepted = agree = 0
+        for f in files:
+            t0 = time.perf_counter()
+            text, conf = backend.transcribe_command(audios[f.name], COMMAND_PROMPT, args.max_tokens)
+            fast_latencies.append((time.perf_counter() - t0) * 1000)
+
+            intent = normalize_command(text)["intent"] if text else "unknown"
+            if conf >= args.min_confidence and intent != "unknown":
+                accepted += 1
+                agree += intent == outputs[f.name]["intent"]
+
+        p50, p95 = np.percentile(fast_latencies, [50, 95])
+        print(
+            f"{name + '/fast':<15} accepted={accepted}/{len(files)} agree={agree}/{accepted}  "
+            f"p50={p50:8.1f}ms  p95={p95:8.1f}ms"
+        )
+
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--audio-dir", type=str, required=True, help="녹음된 한국어 명령 디렉토리")
+    parser.add_argument("--labels", type=str, default=None, help="'파일명,intent' CSV")
+    parser.add_argument("--backends", type=str, default=",".join(STT_BACKENDS))
+    parser.add_argument("--model-size", type=str, default="base")
+    parser.add_argument("--beam-size", type=int, default=1)
+    parser.add_argument("--compute-type", type=str, default="int8")
+    parser.add_argument("--device", type=str, default=None, help="cpu / cuda (기본: 자동)")
+    parser.add_argument("--fast-path", action="store_true", help="명령 어휘 빠른 경로도 측정")
+    parser.add_argument("--min-confidence", type=float, default=0.6)
+    parser.add_argument("--max-tokens", type=int, default=16)
+    args = parser.parse_args()
+
+    device = args.device or ("cuda" if torch.cuda.is_available() else "cpu")
+    files = sorted(
+        p for p in Path(args.audio_dir).iterdir()
+        if p.suffix.lower() in AUDIO_EXTENSIONS
+    )
+    if not files:
+        parser.error(f"{args.audio_dir} 에 오디오 파일이 없습니다.")
+
+    # 디코딩은 서비스와 동일하게 메모리에서 한 번만 수행 (백엔드 비교에서 제외)
+    audios = {f.name: decode_audio(f.read_bytes()) for f in files}
+
+    labels = load_labels(args.labels)
+    names = [n.strip() for n in args.backends.split(",")]
+
+    print(f"[stt_bench] files={len(files)} device={device} model={args.model_size}")
+    results = {name: run_backend(name, args, files, audios, device) for name in names}
+
+    # 백엔드 간 intent 일치율
+    if len(names) >= 2:
+        base = results[names[0]]
+        for other in names[1:]:
+            same = sum(base[f.name]["intent"] == results[other][f.name]["intent"] for f in files)
+            print(f"intent agreement {names[0]} vs {other}: {same}/{len(files)}")
+            for f in files:
+                a, b = base[f.name], results[other][f.name]
+                if a["intent"] != b["intent"]:
+                    print(f"  {f.name}: {a['intent']} ({a['raw']}) != {b['intent']} ({b['raw']})")
+
+    # 정답 intent 대비 정확도
+    if labels:
+        for name in names:
+            scored = [f for f in files if f.name in labels]
+            hit = sum(results[name][f.name]["intent"] == labels[f.name] for f in scored)
+            print(f"intent accuracy {name}: {hit}/{len(scored)}")
+
+
+if __name__ == "__main__":
+    main()
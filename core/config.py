@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import ClassVar, Set
+from typing import ClassVar, Set, Tuple
 from pydantic_settings import BaseSettings
 
 
@@ -18,6 +18,60 @@ class Settings(BaseSettings):
     # 실행 디바이스 ("cuda" or "cpu")
     DEVICE: str = "cuda"
 
+    # 서버 시작 시 모델 사전 로딩 / warm-up
+    MODEL_PRELOAD_PARALLEL: bool = True
+    MODEL_WARMUP_RUNS: int = 2
+    WARMUP_IMAGE_SIZE: Tuple[int, int] = (360, 640)  # (h, w) — 클라이언트 캡처 해상도
+
+    # 추적 객체 이력 (다중 프레임 TTC 추정)
+    TRACK_HISTORY_CAPACITY: int = 256   # 동시에 보관하는 track 수 (초과 시 가장 오래된 track 교체)
+    TRACK_HISTORY_WINDOW: int = 4       # 직선 적합에 사용하는 최근 표본 수
+    TRACK_HISTORY_MAX_GAP_SEC: float = 2.0  # 표본 간격이 이보다 길면 이력 초기화
+    FRAME_INTERVAL_SEC: float = 0.9     # 클라이언트 캡처 주기 (app.js INTERVAL_MS) — 이전 프레임 환산 간격
+    FRAME_CLOCK_MAX_LAG_SEC: float = 5.0    # 캡처 시각 변환 결과가 이보다 과거이면 시계 오프셋 재설정
+    FRAME_CLOCK_MAX_SESSIONS: int = 256
+
+    # 단안 거리 추정 (카메라 가정값)
+    CAMERA_HFOV_DEG: float = 66.0       # 후면 카메라 수평 화각
+    CAMERA_FOCAL_PX: float = 0.0        # 캡처 해상도 기준 보정 초점 거리 (0 이면 화각으로 계산)
+    CAMERA_HEIGHT_M: float = 1.3        # 휴대폰 높이 (가슴 위치)
+
+    # 카메라 이동 보정 (세션별 phase correlation)
+    EGO_MOTION_ENABLED: bool = True
+    EGO_MOTION_WIDTH: int = 160             # 추정용 축소 폭 (px)
+    EGO_MOTION_MIN_RESPONSE: float = 0.1    # phase correlation 응답 하한 (미만이면 이동 0)
+    EGO_MOTION_MAX_SHIFT_RATIO: float = 0.25  # 프레임 폭 대비 최대 허용 이동
+    EGO_MOTION_MAX_SESSIONS: int = 256
+
+    # 환경 상태 평활 (세션별 EMA + hysteresis)
+    ENV_EMA_TAU_SEC: float = 1.5        # 구역 비율 지수 이동 평균 시간 상수
+    ENV_STATE_MAX_SESSIONS: int = 256
+
+    # 음성 인식 (STT)
+    STT_BACKEND: str = "whisper"        # "whisper" | "faster_whisper"
+    STT_MODEL_SIZE: str = "base"
+    STT_BEAM_SIZE: int = 1              # 1 = greedy
+    STT_COMPUTE_TYPE: str = "int8"      # faster_whisper 전용 (int8 / int8_float16 / float16 ...)
+    STT_FAST_PATH: bool = True          # 명령 어휘 prompt 편향 빠른 경로
+    STT_FAST_PATH_MIN_CONFIDENCE: float = 0.6
+    STT_FAST_PATH_MAX_TOKENS: int = 16
+    STT_INTENT_MIN_CONFIDENCE: float = 0.5  # 빠른 경로 채택 시 intent 모호도 하한
+    STT_WORKERS: int = 1                # STT 전용 작업 스레드 수
+    STT_MAX_QUEUE: int = 4              # 실행 중 외 대기 가능 작업 수
+    STT_TIMEOUT_SEC: float = 10.0
+    STT_RETRY_AFTER_SEC: int = 1
+
+    # 스트리밍 STT (WebSocket)
+    STT_VAD_THRESHOLD: float = 0.01     # RMS 최소 임계값
+    STT_VAD_HANGOVER_MS: int = 400      # 발화 종료 판정 무음 길이
+    STT_PARTIAL_INTERVAL_MS: int = 600  # 중간 디코딩 간격 (발화 누적 길이 기준)
+    STT_STREAM_MAX_SEC: float = 6.0
+
+    # 서버 측 TTS (선택, "" 이면 브라우저 speechSynthesis 사용)
+    TTS_ENGINE: str = ""                # "espeak-ng"
+    TTS_VOICE: str = "ko"
+    TTS_RATE_WPM: int = 175
+
     # 업로드 파일 저장 경로
     UPLOAD_DIR: Path = BASE_DIR / "uploads"
 
@@ -31,6 +85,23 @@ class Settings(BaseSettings):
 
     # Kakao Local API
     KAKAO_REST_API_KEY: str = ""  # .env 파일에서 로드
+    KAKAO_BASE_URL: str = "https://dapi.kakao.com/v2/local"  # 벤치마크 시 로컬 fixture 서버로 교체
+    KAKAO_RECORD_DIR: str = ""  # 설정 시 실제 응답을 fixture로 기록
+
+    # Kakao 호출 예산 (워커 간 SQLite 공유)
+    CACHE_DIR: Path = BASE_DIR / "cache"
+    KAKAO_QUOTA_DB: Path = CACHE_DIR / "kakao_quota.sqlite3"
+    KAKAO_RATE_PER_SEC: float = 10.0
+    KAKAO_RATE_BURST: int = 20
+    KAKAO_DAILY_LIMIT: int = 100000
+    KAKAO_CACHE_TTL_SEC: float = 86400.0
+    KAKAO_COORD_ROUND_DIGITS: int = 4   # 요청 병합 / 캐시 키 좌표 반올림 (약 10m)
+
+    # 위치 컨텍스트 재사용 (세션별)
+    LOCATION_CONTEXT_GEOCODE_RADIUS_M: float = 30.0   # 역지오코딩 재사용 이동 거리
+    LOCATION_CONTEXT_POI_RADIUS_M: float = 150.0      # POI / 시설 검색 재사용 이동 거리
+    LOCATION_CONTEXT_TTL_SEC: float = 300.0
+    LOCATION_CONTEXT_MAX_SESSIONS: int = 256
 
     class Config:
         env_file = ".env"
@@ -39,6 +110,7 @@ class Settings(BaseSettings):
     def ensure_directories(self):
         """필수 디렉토리 생성"""
         self.UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
 # 전역 설정 인스턴스
@@ -0,0 +1,114 @@
+import math
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.config import settings
+
+
+# 클래스별 실제 높이 사전값 (m)
+CLASS_HEIGHTS_M: Dict[str, float] = {
+    "barricade": 1.0,
+    "bench": 0.85,
+    "bicycle": 1.1,
+    "bollard": 0.9,
+    "bus": 3.2,
+    "car": 1.5,
+    "carrier": 0.7,
+    "cat": 0.3,
+    "chair": 0.9,
+    "dog": 0.5,
+    "fire_hydrant": 0.7,
+    "kiosk": 1.8,
+    "motorcycle": 1.2,
+    "movable_signage": 1.2,
+    "parking_meter": 1.3,
+    "person": 1.7,
+    "pole": 3.0,
+    "potted_plant": 0.8,
+    "power_controller": 1.5,
+    "scooter": 1.1,
+    "stop": 0.8,
+    "stroller": 1.0,
+    "table": 0.75,
+    "traffic_light": 1.0,
+    "traffic_light_controller": 1.6,
+    "traffic_sign": 0.8,
+    "tree_trunk": 2.5,
+    "truck": 3.0,
+    "wheelchair": 1.3,
+}
+DEFAULT_HEIGHT_M = 1.0
+
+# 지면에 닿지 않는 클래스 (박스 하단 ≠ 지면 접점 → 지면 가정 제외)
+ELEVATED_CLASSES = frozenset({"traffic_light", "traffic_sign", "stop"})
+
+EDGE_MARGIN_PX = 2.0         # 프레임 가장자리에 닿은 박스 = 잘린 박스
+MIN_BELOW_HORIZON_PX = 4.0   # 지평선 바로 아래 박스는 지면 가정 불안정
+
+PROXIMITY_SCALE_M = 3.0      # proximity_score 가 0.5 가 되는 거리
+
+
+def focal_length_px(frame_w: int) -> float:
+    """보정값(CAMERA_FOCAL_PX) 우선, 없으면 수평 화각으로 계산"""
+    if settings.CAMERA_FOCAL_PX > 0:
+        return settings.CAMERA_FOCAL_PX
+    return (frame_w / 2) / math.tan(math.radians(settings.CAMERA_HFOV_DEG) / 2)
+
+
+def estimate_distances(
+    bboxes: np.ndarray,
+    classes: Sequence[str],
+    frame_w: int,
+    frame_h: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    박스 N개 거리(m) 일괄 추정 → (거리, 상한값 여부)
+
+    - 크기 기반: 클래스 실제 높이 × 초점 거리 / 박스 높이
+    - 지면 기반: 카메라 높이 × 초점 거리 / (박스 하단 - 지평선)  (카메라 수평 가정)
+    - 둘 다 유효 → 기하 평균, 위쪽만 잘린 박스 → 지면 기반
+    - 아래쪽이 잘린 박스 (프레임 하단에 닿음): 박스 높이가 잘려 크기 기반은 실제보다 멂
+      → 상한값 (지면 객체는 화면 하단 지면 거리로 제한), 상한값 여부 True
+    """
+    b = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    if len(b) == 0:
+        return np.zeros(0), np.zeros(0, dtype=bool)
+
+    f = focal_length_px(frame_w)
+    real_h = np.array([CLASS_HEIGHTS_M.get(c, DEFAULT_HEIGHT_M) for c in classes])
+    grounded = np.array([c not in ELEVATED_CLASSES for c in classes])
+
+    h_px = np.maximum(b[:, 3] - b[:, 1], 1.0)
+    d_size = real_h * f / h_px
+
+    below = b[:, 3] - frame_h / 2
+    bottom_clear = b[:, 3] < frame_h - EDGE_MARGIN_PX
+    ground_ok = grounded & bottom_clear & (below > MIN_BELOW_HORIZON_PX)
+    d_ground = settings.CAMERA_HEIGHT_M * f / np.maximum(below, MIN_BELOW_HORIZON_PX)
+
+    size_ok = (b[:, 1] > EDGE_MARGIN_PX) & bottom_clear
+
+    # 화면 하단에 보이는 가장 가까운 지면까지 거리 → 하단이 잘린 지면 객체는 이보다 가까움
+    d_frame_bottom = settings.CAMERA_HEIGHT_M * f / max(frame_h / 2, MIN_BELOW_HORIZON_PX)
+    upper = np.where(grounded, np.minimum(d_size, d_frame_bottom), d_size)
+
+    distances = np.where(
+        ground_ok & size_ok, np.sqrt(d_size * d_ground),
+        np.where(ground_ok, d_ground, np.where(bottom_clear, d_size, upper))
+    )
+    return distances, ~bottom_clear
+
+
+def ranking_distance(distance_m: Optional[float], upper_bound: bool = False) -> Optional[float]:
+    """순위 / 근접도용 거리 — 상한값(하단이 잘린 박스)은 0 (가장 가까운 객체로 취급)"""
+    if upper_bound:
+        return 0.0
+    return distance_m
+
+
+def proximity_score(distance_m: Optional[float]) -> float:
+    """거리 → 근접도 (0m: 1.0, PROXIMITY_SCALE_M: 0.5, 멀수록 0)"""
+    if distance_m is None:
+        return 0.0
+    return 1.0 / (1.0 + max(distance_m, 0.0) / PROXIMITY_SCALE_M)
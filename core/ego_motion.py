@@ -0,0 +1,78 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.config import settings
+
+
+class EgoMotionEstimator:
+    """
+    세션별 카메라 전역 이동(평행 이동) 추정
+
+    - 축소 grayscale 이전 프레임과 phase correlation
+    - 프레임 간 화면 이동량을 누적 → 추적 좌표 안정화에 사용
+      (안정화 좌표 = 이미지 좌표 - 누적 이동량)
+    - 상관 응답이 낮거나 이동량이 비정상적으로 크면 해당 프레임 이동 0 처리
+    - 평행 이동은 bbox 크기를 바꾸지 않으므로 높이는 보정하지 않음
+      (전진 보행으로 인한 크기 증가는 실제 접근이므로 유지)
+    """
+
+    __slots__ = ("prev", "window", "scale", "shift")
+
+    def __init__(self):
+        self.prev: Optional[np.ndarray] = None
+        self.window: Optional[np.ndarray] = None
+        self.scale = 1.0
+        self.shift = np.zeros(2)  # 누적 화면 이동 (x, y) — 원본 해상도 px
+
+    def _prepare(self, image_bgr: np.ndarray) -> np.ndarray:
+        h, w = image_bgr.shape[:2]
+        self.scale = settings.EGO_MOTION_WIDTH / w
+        size = (settings.EGO_MOTION_WIDTH, max(1, int(round(h * self.scale))))
+        gray = cv2.cvtColor(
+            cv2.resize(image_bgr, size, interpolation=cv2.INTER_AREA),
+            cv2.COLOR_BGR2GRAY,
+        )
+        return gray.astype(np.float32)
+
+    def update(self, image_bgr: np.ndarray) -> Tuple[float, float]:
+        """현재 프레임 반영 → 누적 화면 이동 (x, y)"""
+        curr = self._prepare(image_bgr)
+
+        if self.prev is not None and self.prev.shape == curr.shape:
+            if self.window is None or self.window.shape != curr.shape:
+                self.window = cv2.createHanningWindow(curr.shape[::-1], cv2.CV_32F)
+
+            (dx, dy), response = cv2.phaseCorrelate(self.prev, curr, self.window)
+            step = np.array([dx, dy]) / self.scale
+            max_shift = settings.EGO_MOTION_MAX_SHIFT_RATIO * image_bgr.shape[1]
+
+            if response >= settings.EGO_MOTION_MIN_RESPONSE and np.all(np.abs(step) <= max_shift):
+                self.shift += step
+
+        self.prev = curr
+        return float(self.shift[0]), float(self.shift[1])
+
+
+_estimators: "OrderedDict[str, EgoMotionEstimator]" = OrderedDict()
+_estimators_lock = threading.Lock()
+
+
+def get_ego_motion(session_id: Optional[str]) -> EgoMotionEstimator:
+    """세션 id별 EgoMotionEstimator 조회 (LRU, 세션 id 없으면 일회용)"""
+    if not session_id:
+        return EgoMotionEstimator()
+
+    with _estimators_lock:
+        est = _estimators.get(session_id)
+        if est is None:
+            est = EgoMotionEstimator()
+            _estimators[session_id] = est
+            while len(_estimators) > settings.EGO_MOTION_MAX_SESSIONS:
+                _estimators.popitem(last=False)
+        else:
+            _estimators.move_to_end(session_id)
+        return est
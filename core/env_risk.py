@@ -1,48 +1,164 @@
-from typing import Dict, Iterable, List, Optional
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.config import settings
 
 # 환경 분류 기준
 DANGER_ZONES: Iterable[str] = ("roadway", "caution_zone")
 SAFE_ZONES: Iterable[str] = ("sidewalk", "braille_guide_blocks")
 
+# 구역 판정 임계값 (현장 테스트 기준값)
+# - ENTER: 프레임 단위 판정 (compute_env_risk) 및 시간 평활 상태 진입
+# - EXIT: 시간 평활 상태 해제 (ENTER 와의 사이 구간은 상태 유지)
+DANGER_ENTER_RATIO = 0.25
+DANGER_EXIT_RATIO = 0.15
+SAFE_ENTER_RATIO = 0.15
+SAFE_EXIT_RATIO = 0.08
 
-def compute_env_risk(env_result: Optional[Dict[str, float]]) -> Dict[str, object]:
+ENV_ZONES: Tuple[str, ...] = tuple(DANGER_ZONES) + tuple(SAFE_ZONES)
+ENTER_THRESHOLDS = np.array([DANGER_ENTER_RATIO] * len(DANGER_ZONES) + [SAFE_ENTER_RATIO] * len(SAFE_ZONES))
+EXIT_THRESHOLDS = np.array([DANGER_EXIT_RATIO] * len(DANGER_ZONES) + [SAFE_EXIT_RATIO] * len(SAFE_ZONES))
+IS_DANGER = np.array([True] * len(DANGER_ZONES) + [False] * len(SAFE_ZONES))
+
+
+def locate_zone(env_result: Dict, zone: str) -> Optional[Tuple[int, int]]:
     """
-    환경 분할 결과를 기반으로 위험 여부 판단
+    구역이 가장 많이 차지한 격자 칸 (열, 행)
+
+    - 열: 0 왼쪽 / 1 정면 / 2 오른쪽, 행: 0 먼 곳 / 1 가까운 곳
+    - 같은 점유율이면 가까운 곳, 정면 우선
+    - 격자 정보가 없으면 None
     """
-    if env_result is None:
-        env_result = {}
+    grid = (env_result.get("layout") or {}).get(zone)
+    if not grid:
+        return None
+
+    best = None
+    for row in (1, 0):
+        for col in (1, 0, 2):
+            v = grid[row][col]
+            if v > 0 and (best is None or v > best[0]):
+                best = (v, col, row)
+    return None if best is None else (best[1], best[2])
+
 
-    danger: List[str] = []
-    safe: List[str] = []
-
-    # 위험 구역 판별
-    for zone in DANGER_ZONES:
-        ratio = float(env_result.get(f"{zone}_ratio", 0.0))
-        if ratio > 0.25:  # 현장 테스트 기준값
-            danger.append(zone)
-
-    # 안전 구역 판별
-    for zone in SAFE_ZONES:
-        ratio = float(env_result.get(f"{zone}_ratio", 0.0))
-        if ratio > 0.15:
-            safe.append(zone)
-
-    # 주 영역 결정
-    current_zone: Optional[str] = None
-    if danger:
-        current_zone = max(
-            danger,
-            key=lambda z: float(env_result.get(f"{z}_ratio", 0.0))
-        )
-    elif safe:
-        current_zone = max(
-            safe,
-            key=lambda z: float(env_result.get(f"{z}_ratio", 0.0))
-        )
+def summarize_zones(
+    env_result: Dict,
+    danger: List[str],
+    safe: List[str],
+    weights: Dict[str, float],
+) -> Dict[str, object]:
+    """
+    판정된 위험 / 안전 구역 → 응답 형식
+    - current_zone: 위험 구역 우선, 그 안에서 weights(구역 비율) 최대
+    - positions: 구역별 위치 (방향 열, 거리 행)
+    """
+    pool = danger or safe
+    current_zone: Optional[str] = max(pool, key=weights.__getitem__) if pool else None
+
+    positions = {}
+    for zone in danger + safe:
+        cell = locate_zone(env_result, zone)
+        if cell is not None:
+            positions[zone] = cell
 
     return {
         "danger_zones": danger,
         "safe_zones": safe,
         "current_zone": current_zone,
         "is_danger": bool(danger),
+        "positions": positions,
     }
+
+
+def compute_env_risk(env_result: Optional[Dict[str, float]]) -> Dict[str, object]:
+    """
+    환경 분할 결과를 기반으로 위험 여부 판단 (프레임 단위)
+    """
+    if env_result is None:
+        env_result = {}
+
+    ratios = {z: float(env_result.get(f"{z}_ratio", 0.0)) for z in ENV_ZONES}
+    danger = [z for z in DANGER_ZONES if ratios[z] > DANGER_ENTER_RATIO]
+    safe = [z for z in SAFE_ZONES if ratios[z] > SAFE_ENTER_RATIO]
+    return summarize_zones(env_result, danger, safe, ratios)
+
+
+class EnvStateTracker:
+    """
+    세션별 환경 구역 상태 (구역 수 크기의 고정 배열)
+
+    - 구역 비율 지수 이동 평균 (시간 상수 ENV_EMA_TAU_SEC, 프레임 간격 반영)
+      - 위험 구역은 fast-attack: 비율이 평균보다 크면 즉시 반영 (진입 지연 없음), 감소만 평활
+    - 진입: 평균 > ENTER 임계값 / 해제: 평균 < EXIT 임계값 (사이 구간은 상태 유지)
+    - update() 는 상태가 바뀐 구역만 entered / exited 로 반환
+    - 진입 후 아직 안내하지 못한 위험 구역은 pending (mark_announced 전까지 유지)
+    """
+
+    __slots__ = ("ema", "active", "announced", "last_t")
+
+    def __init__(self):
+        self.ema = np.zeros(len(ENV_ZONES))
+        self.active = np.zeros(len(ENV_ZONES), dtype=bool)
+        self.announced = np.zeros(len(ENV_ZONES), dtype=bool)
+        self.last_t: Optional[float] = None
+
+    def update(self, env_result: Optional[Dict], now: float) -> Dict[str, object]:
+        env_result = env_result or {}
+        ratios = np.array([float(env_result.get(f"{z}_ratio", 0.0)) for z in ENV_ZONES])
+
+        if self.last_t is None:
+            self.ema[:] = ratios
+        else:
+            dt = max(now - self.last_t, 0.0)
+            alpha = 1.0 - math.exp(-dt / settings.ENV_EMA_TAU_SEC)
+            self.ema += alpha * (ratios - self.ema)
+            np.maximum(self.ema, ratios, out=self.ema, where=IS_DANGER)
+        self.last_t = now
+
+        prev = self.active.copy()
+        self.active |= self.ema > ENTER_THRESHOLDS
+        self.active &= ~(self.ema < EXIT_THRESHOLDS)
+        self.announced &= self.active
+
+        entered = [ENV_ZONES[i] for i in np.flatnonzero(self.active & ~prev)]
+        exited = [ENV_ZONES[i] for i in np.flatnonzero(prev & ~self.active)]
+        pending = [ENV_ZONES[i] for i in np.flatnonzero(self.active & IS_DANGER & ~self.announced)]
+
+        danger = [ENV_ZONES[i] for i in np.flatnonzero(self.active & IS_DANGER)]
+        safe = [ENV_ZONES[i] for i in np.flatnonzero(self.active & ~IS_DANGER)]
+
+        out = summarize_zones(env_result, danger, safe, dict(zip(ENV_ZONES, self.ema.tolist())))
+        out["entered"] = entered
+        out["exited"] = exited
+        out["pending"] = pending
+        return out
+
+    def mark_announced(self, zone: str) -> None:
+        """위험 구역 안내 완료 → 해제 후 다시 진입할 때까지 pending 제외"""
+        self.announced[ENV_ZONES.index(zone)] = True
+
+
+_trackers: "OrderedDict[str, EnvStateTracker]" = OrderedDict()
+_trackers_lock = threading.Lock()
+
+
+def get_env_tracker(session_id: Optional[str]) -> EnvStateTracker:
+    """세션 id별 EnvStateTracker 조회 (LRU, 세션 id 없으면 일회용)"""
+    if not session_id:
+        return EnvStateTracker()
+
+    with _trackers_lock:
+        tracker = _trackers.get(session_id)
+        if tracker is None:
+            tracker = EnvStateTracker()
+            _trackers[session_id] = tracker
+            while len(_trackers) > settings.ENV_STATE_MAX_SESSIONS:
+                _trackers.popitem(last=False)
+        else:
+            _trackers.move_to_end(session_id)
+        return tracker
@@ -0,0 +1,58 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from core.config import settings
+
+
+class FrameClock:
+    """
+    세션별 클라이언트 캡처 시각(epoch ms) → 서버 monotonic 시각 변환
+
+    - 오프셋 = 지금까지 관측된 (서버 수신 시각 - 캡처 시각) 최소값
+      → 네트워크 / 서버 대기 지연이 가장 작았던 프레임 기준
+    - 클라이언트 시계 변경 등으로 변환 시각이 MAX_LAG 이상 과거이면 오프셋 재설정
+    - 캡처 시각이 없으면 서버 수신 시각 사용
+    """
+
+    __slots__ = ("offset",)
+
+    def __init__(self):
+        self.offset: Optional[float] = None
+
+    def convert(self, captured_at_ms: Optional[float], now: float) -> float:
+        if captured_at_ms is None:
+            return now
+
+        captured = captured_at_ms / 1000.0
+        observed = now - captured
+
+        if (
+            self.offset is None
+            or observed < self.offset
+            or observed - self.offset > settings.FRAME_CLOCK_MAX_LAG_SEC
+        ):
+            self.offset = observed
+
+        return captured + self.offset
+
+
+_clocks: "OrderedDict[str, FrameClock]" = OrderedDict()
+_clocks_lock = threading.Lock()
+
+
+def get_frame_clock(session_id: Optional[str]) -> FrameClock:
+    """세션 id별 FrameClock 조회 (LRU, 세션 id 없으면 일회용)"""
+    if not session_id:
+        return FrameClock()
+
+    with _clocks_lock:
+        clock = _clocks.get(session_id)
+        if clock is None:
+            clock = FrameClock()
+            _clocks[session_id] = clock
+            while len(_clocks) > settings.FRAME_CLOCK_MAX_SESSIONS:
+                _clocks.popitem(last=False)
+        else:
+            _clocks.move_to_end(session_id)
+        return clock
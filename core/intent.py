@@ -0,0 +1,167 @@
+from typing import Dict, List, NamedTuple, Tuple
+
+
+# 음성 명령 intent 표 (위에서부터 우선순위 높음)
+INTENT_RULES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("system_start", ("시작", "실행", "가동", "켜")),
+    ("system_stop", ("종료", "끝내", "꺼", "중지", "멈춰")),
+    ("object_guide", ("객체", "물체", "뭐있어", "위험한거", "위험한게", "주변뭐", "사람있어", "차있어")),
+    ("env_danger", ("위험환경", "위험한곳", "위험해", "조심", "조심할")),
+    ("env_safe", ("안전환경", "안전해", "안전한곳")),
+    ("env_menu", ("환경안내", "환경메뉴", "주변환경")),
+    ("env_alert_off", ("경고꺼", "경고그만", "조용히", "그만말해", "알람꺼", "mute")),
+    ("env_alert_on", ("경고켜", "알람켜", "다시알려줘", "다시경고", "경고재개")),
+    ("location_menu", ("위치메뉴", "위치안내")),
+    ("location_summary", ("여기어디", "지금어디", "내위치", "현재위치")),
+    ("location_address", ("주소", "지번")),
+    ("location_landmark", ("주변건물", "건물", "무슨건물")),
+    ("location_facility", ("편의시설", "생활시설", "시설", "병원", "약국", "마트", "편의점", "지하철", "역")),
+    ("tts_slow", ("천천히", "느리게")),
+    ("tts_fast", ("빨리", "빠르게")),
+    ("tts_normal", ("보통속도", "기본속도", "원래대로")),
+    ("ui_back", ("뒤로", "뒤로가기", "메인", "처음")),
+    ("upload_image", ("사진", "이미지", "찍어", "분석")),
+    ("repeat_last", ("다시말해", "다시", "한번더")),
+)
+
+# 발화 정규화 시 제거하는 표현 (순서대로 적용)
+# "요" 제거 이후에는 "요"를 포함한 표현이 남지 않으므로 해당 항목은 두지 않음
+JUNK_WORDS: Tuple[str, ...] = (
+    "좀", "조금", "약간", "그냥", "이제", "지금", "요",
+    "거야", "거지", "인가", "해줘",
+)
+
+
+class IntentMatch(NamedTuple):
+    start: int
+    end: int
+    keyword: str
+    intent: str
+    priority: int
+
+
+class IntentMatcher:
+    """
+    intent 키워드 Aho-Corasick 자동자
+
+    - 키워드 표를 한 번만 컴파일
+    - 한 번의 문자열 순회로 겹치는 매칭까지 모두 위치와 함께 반환
+    - 우선순위(표 순서)가 가장 높은 intent 선택 + 모호도 기반 신뢰도
+    """
+
+    def __init__(self, rules=INTENT_RULES):
+        self.intents: List[str] = [intent for intent, _ in rules]
+
+        # trie: 노드별 전이 / 실패 링크 / 출력 (keyword, priority)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, int]]] = [[]]
+
+        for priority, (_, keywords) in enumerate(rules):
+            for kw in keywords:
+                self._insert(kw, priority)
+
+        self._build_fail_links()
+
+    def _insert(self, keyword: str, priority: int) -> None:
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((keyword, priority))
+
+    def _build_fail_links(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> List[IntentMatch]:
+        """겹치는 매칭 포함 전체 키워드 매칭 (끝 위치 순)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        matches: List[IntentMatch] = []
+        node = 0
+
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for kw, priority in out[node]:
+                matches.append(
+                    IntentMatch(i + 1 - len(kw), i + 1, kw, self.intents[priority], priority)
+                )
+        return matches
+
+    def best(self, text: str) -> Tuple[str, float, List[IntentMatch]]:
+        """
+        (intent, confidence, matches)
+
+        confidence: 선택된 intent 키워드가 덮는 글자 수 / 모호도 계산 대상 매칭 글자 수
+        - 한 intent 만 매칭 → 1.0
+        - 선택된 intent 매칭과 포함 관계(중첩)인 다른 intent 매칭은 제외
+          (예: "경고꺼" 의 "꺼" → 같은 구간의 해석이므로 경쟁 매칭 아님 → system_stop 1.0)
+        - 떨어진 구간의 다른 intent 키워드가 함께 매칭될수록 낮아짐 (예: "사진다시" → 0.5)
+        """
+        matches = self.find_all(text)
+        if not matches:
+            return "unknown", 0.0, matches
+
+        top = min(m.priority for m in matches)
+        top_spans = [(m.start, m.end) for m in matches if m.priority == top]
+
+        def nested(m: IntentMatch) -> bool:
+            return any(
+                (s <= m.start and m.end <= e) or (m.start <= s and e <= m.end)
+                for s, e in top_spans
+            )
+
+        top_cover = sum(e - s for s, e in top_spans)
+        cover = top_cover + sum(
+            m.end - m.start for m in matches
+            if m.priority != top and not nested(m)
+        )
+        return self.intents[top], top_cover / cover, matches
+
+
+intent_matcher = IntentMatcher()
+
+
+def normalize_text(text: str) -> str:
+    t = text.strip().lower().replace(" ", "")
+    for j in JUNK_WORDS:
+        t = t.replace(j, "")
+    return t
+
+
+def score_command(text: str) -> dict:
+    """normalize_command 결과 + confidence / 매칭 목록"""
+    norm = normalize_text(text)
+    intent, confidence, matches = intent_matcher.best(norm)
+    return {
+        "intent": intent,
+        "raw": text,
+        "norm": norm,
+        "confidence": round(confidence, 3),
+        "matches": [m._asdict() for m in matches],
+    }
+
+
+def normalize_command(text: str) -> dict:
+    norm = normalize_text(text)
+    intent, _, _ = intent_matcher.best(norm)
+    return {"intent": intent, "raw": text, "norm": norm}
@@ -3,11 +3,13 @@ import requests
 from typing import Dict, Any
 
 from core.config import settings
+from core.kakao_fixtures import record_fixture
+from core.kakao_quota import kakao_quota
 
 logger = logging.getLogger(__name__)
 
 KAKAO_REST_API_KEY = getattr(settings, "KAKAO_REST_API_KEY", "")
-BASE_URL = "https://dapi.kakao.com/v2/local"
+BASE_URL = settings.KAKAO_BASE_URL
 
 HEADERS = {
     "Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"
@@ -20,11 +22,17 @@ def _kakao_get(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
         logger.warning("[kakao_api] KAKAO_REST_API_KEY 미설정")
         return {}
 
+    return kakao_quota.call(path, params, _kakao_fetch)
+
+
+def _kakao_fetch(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
     url = f"{BASE_URL}{path}"
     try:
         res = requests.get(url, headers=HEADERS, params=params, timeout=2.5)
         res.raise_for_status()
-        return res.json()
+        data = res.json()
+        record_fixture(path, params, data)
+        return data
     except Exception as e:
         logger.error(f"[kakao_api] API 요청 실패: {e}")
         return {}
@@ -0,0 +1,58 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _norm_value(v: Any) -> str:
+    """쿼리 문자열 / 파이썬 값 모두 같은 키가 되도록 정규화"""
+    try:
+        return repr(round(float(v), settings.KAKAO_COORD_ROUND_DIGITS))
+    except (TypeError, ValueError):
+        return str(v)
+
+
+def fixture_key(path: str, params: Dict[str, Any]) -> str:
+    parts = [f"{k}={_norm_value(params[k])}" for k in sorted(params)]
+    return path + "?" + "&".join(parts)
+
+
+def fixture_path(root: Path, path: str, params: Dict[str, Any]) -> Path:
+    digest = hashlib.sha1(fixture_key(path, params).encode("utf-8")).hexdigest()
+    return Path(root) / f"{digest}.json"
+
+
+def record_fixture(path: str, params: Dict[str, Any], data: Dict[str, Any]) -> None:
+    """KAKAO_RECORD_DIR 설정 시 실제 응답을 fixture 파일로 저장"""
+    root = settings.KAKAO_RECORD_DIR
+    if not root or not data:
+        return
+
+    try:
+        Path(root).mkdir(parents=True, exist_ok=True)
+        entry = {
+            "path": path,
+            "params": {k: v for k, v in params.items()},
+            "response": data,
+        }
+        fixture_path(root, path, params).write_text(
+            json.dumps(entry, ensure_ascii=False, indent=1),
+            encoding="utf-8"
+        )
+    except OSError as e:
+        logger.warning(f"[kakao_fixtures] fixture 저장 실패: {e}")
+
+
+def iter_fixtures(root: Path) -> Iterator[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    """저장된 fixture (path, params, response) 순회"""
+    for f in sorted(Path(root).glob("*.json")):
+        try:
+            entry = json.loads(f.read_text(encoding="utf-8"))
+            yield entry["path"], entry["params"], entry["response"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"[kakao_fixtures] fixture 로드 실패 {f.name}: {e}")
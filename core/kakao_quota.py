@@ -0,0 +1,307 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Kakao 일일 쿼터는 한국 시간 자정 기준으로 초기화
+KST = timezone(timedelta(hours=9))
+
+COALESCE_WAIT_SEC = 5.0
+CACHE_PRUNE_EVERY = 100
+
+
+def request_key(path: str, params: Dict[str, Any]) -> str:
+    """경로 + (좌표 반올림된) 파라미터 기반 요청 키"""
+    digits = settings.KAKAO_COORD_ROUND_DIGITS
+    parts = []
+    for k in sorted(params):
+        v = params[k]
+        if isinstance(v, float):
+            v = round(v, digits)
+        parts.append(f"{k}={v}")
+    return path + "?" + "&".join(parts)
+
+
+class KakaoQuota:
+    """
+    Kakao REST 호출 예산 관리자 (워커 간 SQLite 공유)
+
+    - token bucket 기반 초당 호출 제한 + 일일 쿼터
+    - 동일 요청(경로 + 반올림 파라미터) 동시 호출 병합
+    - 성공 응답 캐시 → 예산 소진 / 호출 실패 시 캐시 응답으로 대체
+    - 호출 / 병합 / 제한 / 캐시 대체 횟수 집계
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        rate_per_sec: float,
+        burst: int,
+        daily_limit: int,
+        cache_ttl_sec: float,
+    ):
+        self.db_path = Path(db_path)
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.daily_limit = daily_limit
+        self.cache_ttl_sec = cache_ttl_sec
+
+        self._local = threading.local()
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._puts = 0
+
+        self._init_db()
+
+    # ------------------------
+    # SQLite
+    # ------------------------
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=1.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS bucket (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS daily (
+                day TEXT PRIMARY KEY,
+                used INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                stored REAL NOT NULL
+            );
+            """
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO bucket (id, tokens, updated) VALUES (0, ?, ?)",
+            (float(self.burst), time.time()),
+        )
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(KST).strftime("%Y-%m-%d")
+
+    # ------------------------
+    # Budget
+    # ------------------------
+    def try_acquire(self) -> bool:
+        """토큰 1개 + 일일 쿼터 1회 소비 (실패 시 False)"""
+        now = time.time()
+        day = self._today()
+        conn = self._conn()
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                tokens, updated = conn.execute(
+                    "SELECT tokens, updated FROM bucket WHERE id = 0"
+                ).fetchone()
+                tokens = min(
+                    float(self.burst),
+                    tokens + max(0.0, now - updated) * self.rate_per_sec
+                )
+
+                row = conn.execute(
+                    "SELECT used FROM daily WHERE day = ?", (day,)
+                ).fetchone()
+                used = row[0] if row else 0
+
+                if tokens < 1.0 or used >= self.daily_limit:
+                    conn.execute(
+                        "UPDATE bucket SET tokens = ?, updated = ? WHERE id = 0",
+                        (tokens, now),
+                    )
+                    conn.execute("COMMIT")
+                    return False
+
+                conn.execute(
+                    "UPDATE bucket SET tokens = ?, updated = ? WHERE id = 0",
+                    (tokens - 1.0, now),
+                )
+                conn.execute(
+                    "INSERT INTO daily (day, used) VALUES (?, 1) "
+                    "ON CONFLICT(day) DO UPDATE SET used = used + 1",
+                    (day,),
+                )
+                conn.execute("COMMIT")
+                return True
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            # 쿼터 DB 장애 시 서비스는 유지 (fail-open)
+            logger.warning(f"[kakao_quota] 쿼터 DB 오류, 제한 없이 진행: {e}")
+            return True
+
+    def count(self, name: str, n: int = 1) -> None:
+        try:
+            self._conn().execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + ?",
+                (name, n, n),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"[kakao_quota] 카운터 기록 실패: {e}")
+
+    # ------------------------
+    # Response cache
+    # ------------------------
+    def cache_get(self, key: str) -> Dict[str, Any]:
+        try:
+            row = self._conn().execute(
+                "SELECT body, stored FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return {}
+
+        if not row or time.time() - row[1] >= self.cache_ttl_sec:
+            return {}
+        return json.loads(row[0])
+
+    def cache_put(self, key: str, data: Dict[str, Any]) -> None:
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, stored) VALUES (?, ?, ?)",
+                (key, json.dumps(data, ensure_ascii=False), now),
+            )
+            self._puts += 1
+            if self._puts % CACHE_PRUNE_EVERY == 0:
+                conn.execute(
+                    "DELETE FROM responses WHERE stored < ?",
+                    (now - self.cache_ttl_sec,),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"[kakao_quota] 응답 캐시 저장 실패: {e}")
+
+    # ------------------------
+    # Call
+    # ------------------------
+    def call(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        fetch: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        예산 확인 후 fetch(path, params) 호출
+
+        - 같은 키의 요청이 진행 중이면 그 결과를 공유
+        - 예산 소진 / 빈 응답이면 캐시된 응답 반환 (없으면 {})
+        """
+        key = request_key(path, params)
+
+        with self._inflight_lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._inflight[key] = fut
+
+        if not leader:
+            self.count("coalesced")
+            try:
+                return fut.result(timeout=COALESCE_WAIT_SEC)
+            except Exception:
+                return self.cache_get(key)
+
+        data: Dict[str, Any] = {}
+        try:
+            if self.try_acquire():
+                self.count("upstream")
+                data = fetch(path, params)
+                if data:
+                    self.cache_put(key, data)
+                else:
+                    self.count("upstream_failed")
+            else:
+                self.count("throttled")
+
+            if not data:
+                data = self.cache_get(key)
+                if data:
+                    self.count("cache_fallback")
+        finally:
+            fut.set_result(data)
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+        return data
+
+    # ------------------------
+    # Metrics
+    # ------------------------
+    def metrics(self) -> Dict[str, Any]:
+        day = self._today()
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT used FROM daily WHERE day = ?", (day,)
+            ).fetchone()
+            tokens, updated = conn.execute(
+                "SELECT tokens, updated FROM bucket WHERE id = 0"
+            ).fetchone()
+            counters = dict(conn.execute("SELECT name, value FROM counters"))
+            cached = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        except sqlite3.Error as e:
+            return {"error": str(e)}
+
+        used = row[0] if row else 0
+        tokens = min(
+            float(self.burst),
+            tokens + max(0.0, time.time() - updated) * self.rate_per_sec
+        )
+
+        return {
+            "day": day,
+            "daily_limit": self.daily_limit,
+            "daily_used": used,
+            "daily_remaining": max(0, self.daily_limit - used),
+            "rate_per_sec": self.rate_per_sec,
+            "tokens_available": round(tokens, 2),
+            "cached_responses": cached,
+            "inflight": len(self._inflight),
+            "counters": counters,
+        }
+
+
+kakao_quota = KakaoQuota(
+    db_path=settings.KAKAO_QUOTA_DB,
+    rate_per_sec=settings.KAKAO_RATE_PER_SEC,
+    burst=settings.KAKAO_RATE_BURST,
+    daily_limit=settings.KAKAO_DAILY_LIMIT,
+    cache_ttl_sec=settings.KAKAO_CACHE_TTL_SEC,
+)
@@ -1,15 +1,22 @@
 from __future__ import annotations
 import logging
 import math
-from typing import Any, Dict, List
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import requests
 from core.config import settings
+from core.kakao_fixtures import record_fixture
+from core.kakao_quota import kakao_quota
 
 logger = logging.getLogger(__name__)
 
 KAKAO_KEY = settings.KAKAO_REST_API_KEY
-BASE_URL = "https://dapi.kakao.com/v2/local"
+BASE_URL = settings.KAKAO_BASE_URL
 HEADERS = {"Authorization": f"KakaoAK {KAKAO_KEY}"}
 
 
@@ -26,11 +33,29 @@ def _haversine(lng1, lat1, lng2, lat2):
     )
 
 
+def _haversine_np(lng1, lat1, lng2, lat2):
+    """기준 좌표 → 좌표 배열 간 거리(m) 벡터 계산"""
+    R = 6371000
+    lat2 = np.asarray(lat2, dtype=np.float64)
+    lng2 = np.asarray(lng2, dtype=np.float64)
+    return 2 * R * np.arcsin(
+        np.sqrt(
+            np.sin(np.radians(lat2 - lat1) / 2) ** 2 +
+            math.cos(math.radians(lat1)) * np.cos(np.radians(lat2)) *
+            np.sin(np.radians(lng2 - lng1) / 2) ** 2
+        )
+    )
+
+
 def _kakao_get(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
     if not KAKAO_KEY:
         logger.error("[location] Kakao API Key 누락")
         return {}
 
+    return kakao_quota.call(path, params, _kakao_fetch)
+
+
+def _kakao_fetch(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
     try:
         r = requests.get(
             BASE_URL + path,
@@ -39,7 +64,9 @@ def _kakao_get(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
             timeout=3
         )
         r.raise_for_status()
-        return r.json()
+        data = r.json()
+        record_fixture(path, params, data)
+        return data
     except Exception as e:
         logger.error(f"[KAKAO API ERROR] {e}")
         logger.error(f"URL = {BASE_URL + path}")
@@ -122,31 +149,120 @@ def _search_category(code, lat, lng):
     return data.get("documents", []), radius
 
 
-def _score_poi(poi, lat, lng, weight):
-    try:
-        dist = _haversine(lng, lat, float(poi["x"]), float(poi["y"]))
-        poi["_distance"] = dist
-        poi["_score"] = weight - dist
-        return poi
-    except Exception:
-        return None
+# 주요 건물(랜드마크) 판별 키워드 — POI 묶음 생성 시 한 번만 검사
+LANDMARK_KEYWORDS = ("학교", "청", "구청", "시청", "센터")
+_LANDMARK_RE = re.compile("|".join(re.escape(k) for k in LANDMARK_KEYWORDS))
+
+
+class PoiBatch:
+    """
+    POI 열(column) 단위 묶음
 
+    - Kakao 장소 id 기준 중복 제거 (더 높은 우선순위 유지)
+    - 위도 / 경도 / 우선순위를 NumPy 배열로 보관
+    - 거리·점수 계산과 상위 k개 선택을 벡터 연산으로 수행
+    """
+
+    __slots__ = ("ids", "names", "lat", "lng", "priority", "is_landmark")
+
+    def __init__(self, ids, names, lat, lng, priority):
+        self.ids: List[str] = list(ids)
+        self.names: List[str] = list(names)
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.priority = np.asarray(priority, dtype=np.float64)
+        self.is_landmark = np.fromiter(
+            (_LANDMARK_RE.search(n) is not None for n in self.names),
+            dtype=bool,
+            count=len(self.names),
+        )
 
-def _gather_pois(lat, lng) -> List[Dict]:
-    results = []
+    @classmethod
+    def from_documents(
+        cls,
+        groups: Iterable[Tuple[List[Dict[str, Any]], float]]
+    ) -> "PoiBatch":
+        """(Kakao documents, 우선순위) 묶음들로부터 중복 없는 POI 배치 생성"""
+        index: Dict[str, int] = {}
+        ids, names, lats, lngs, prios = [], [], [], [], []
+
+        for docs, weight in groups:
+            for p in docs:
+                try:
+                    x = float(p["x"])
+                    y = float(p["y"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+                name = p.get("place_name", "")
+                pid = p.get("id") or f"{name}@{x},{y}"
+
+                i = index.get(pid)
+                if i is not None:
+                    # 여러 카테고리에 중복된 장소 → 높은 우선순위만 유지
+                    if weight > prios[i]:
+                        prios[i] = weight
+                    continue
+
+                index[pid] = len(ids)
+                ids.append(pid)
+                names.append(name)
+                lats.append(y)
+                lngs.append(x)
+                prios.append(weight)
+
+        return cls(ids, names, lats, lngs, prios)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def distances(self, lat: float, lng: float) -> np.ndarray:
+        return _haversine_np(lng, lat, self.lng, self.lat)
+
+    def top_k(
+        self,
+        lat: float,
+        lng: float,
+        k: int = 1,
+        mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float, float]]:
+        """
+        점수(우선순위 - 거리) 상위 k개 선택
+
+        Returns:
+            [(index, distance_m, score), ...] — 점수 내림차순
+        """
+        if not len(self) or k <= 0:
+            return []
+
+        dist = self.distances(lat, lng)
+        score = self.priority - dist
+
+        cand = np.flatnonzero(mask) if mask is not None else np.arange(len(self))
+        if cand.size == 0:
+            return []
+
+        cand_score = score[cand]
+        k = min(k, cand.size)
+
+        if k == 1:
+            order = np.array([np.argmax(cand_score)])
+        else:
+            part = np.argpartition(-cand_score, k - 1)[:k]
+            order = part[np.argsort(-cand_score[part], kind="stable")]
+
+        return [(int(i), float(dist[i]), float(score[i])) for i in cand[order]]
+
+
+def _gather_pois(lat, lng) -> PoiBatch:
+    groups = []
 
     subways, _ = _search_category("SW8", lat, lng)
-    for p in subways:
-        s = _score_poi(p, lat, lng, PRIORITY["SW8"])
-        if s:
-            results.append(s)
+    groups.append((subways, PRIORITY["SW8"]))
 
     for code in ["HP8", "SC4", "PO3"]:
         items, _ = _search_category(code, lat, lng)
-        for p in items:
-            s = _score_poi(p, lat, lng, PRIORITY[code])
-            if s:
-                results.append(s)
+        groups.append((items, PRIORITY[code]))
 
     crossroads = _kakao_get(
         "/search/keyword.json",
@@ -158,37 +274,188 @@ def _gather_pois(lat, lng) -> List[Dict]:
             "size": 5,
         }
     ).get("documents", [])
-
-    for p in crossroads:
-        s = _score_poi(p, lat, lng, PRIORITY["CROSSROAD"])
-        if s:
-            results.append(s)
-
-    return results
-
-
-def get_location_summary(lat: float, lng: float) -> str:
+    groups.append((crossroads, PRIORITY["CROSSROAD"]))
+
+    return PoiBatch.from_documents(groups)
+
+
+class LocationContext:
+    """
+    세션별 위치 컨텍스트
+
+    - 최근 역지오코딩 결과 / 수집된 POI / 시설 검색 결과를
+      조회 시각·좌표와 함께 보관
+    - 보행자가 항목별 허용 거리 이상 이동하면 해당 항목만 무효화
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+        self.geocode: Optional[Dict[str, Any]] = None
+        self.geocode_pos: Optional[Tuple[float, float]] = None
+        self.geocode_time: float = 0.0
+
+        self.pois: Optional[PoiBatch] = None
+        self.pois_pos: Optional[Tuple[float, float]] = None
+        self.pois_time: float = 0.0
+
+        # category_code -> (PoiBatch, radius, (lat, lng), timestamp)
+        self.facilities: Dict[str, Tuple[PoiBatch, int, Tuple[float, float], float]] = {}
+
+    @staticmethod
+    def _is_fresh(pos, ts, lat, lng, radius_m, now) -> bool:
+        if pos is None:
+            return False
+        if now - ts >= settings.LOCATION_CONTEXT_TTL_SEC:
+            return False
+        return _haversine(lng, lat, pos[1], pos[0]) < radius_m
+
+    def update_position(self, lat: float, lng: float) -> None:
+        """이동 거리·경과 시간을 벗어난 항목만 개별 무효화"""
+        now = time.monotonic()
+
+        if not self._is_fresh(
+            self.geocode_pos, self.geocode_time, lat, lng,
+            settings.LOCATION_CONTEXT_GEOCODE_RADIUS_M, now
+        ):
+            self.geocode = None
+            self.geocode_pos = None
+
+        if not self._is_fresh(
+            self.pois_pos, self.pois_time, lat, lng,
+            settings.LOCATION_CONTEXT_POI_RADIUS_M, now
+        ):
+            self.pois = None
+            self.pois_pos = None
+
+        stale = [
+            code for code, (_, _, pos, ts) in self.facilities.items()
+            if not self._is_fresh(
+                pos, ts, lat, lng,
+                settings.LOCATION_CONTEXT_POI_RADIUS_M, now
+            )
+        ]
+        for code in stale:
+            del self.facilities[code]
+
+    def reverse_geocode(self, lat: float, lng: float) -> Dict[str, Any]:
+        with self.lock:
+            self.update_position(lat, lng)
+            if self.geocode is None:
+                data = _reverse_geocode(lat, lng)
+                if not data:
+                    return data
+                self.geocode = data
+                self.geocode_pos = (lat, lng)
+                self.geocode_time = time.monotonic()
+            return self.geocode
+
+    def gather_pois(self, lat: float, lng: float) -> PoiBatch:
+        with self.lock:
+            self.update_position(lat, lng)
+            if self.pois is None:
+                pois = _gather_pois(lat, lng)
+                if not len(pois):
+                    return pois
+                self.pois = pois
+                self.pois_pos = (lat, lng)
+                self.pois_time = time.monotonic()
+            return self.pois
+
+    def search_facility(self, code: str, lat: float, lng: float) -> Tuple[PoiBatch, int]:
+        with self.lock:
+            self.update_position(lat, lng)
+            cached = self.facilities.get(code)
+            if cached is not None:
+                return cached[0], cached[1]
+
+            docs, radius = _search_category(code, lat, lng)
+            pois = PoiBatch.from_documents(
+                [(docs, PRIORITY.get(code, PRIORITY["DEFAULT"]))]
+            )
+            if len(pois):
+                self.facilities[code] = (pois, radius, (lat, lng), time.monotonic())
+            return pois, radius
+
+
+_contexts: "OrderedDict[str, LocationContext]" = OrderedDict()
+_contexts_lock = threading.Lock()
+
+
+def get_location_context(session_id: Optional[str]) -> LocationContext:
+    """세션 id별 LocationContext 조회 (LRU, 세션 id 없으면 일회용)"""
+    if not session_id:
+        return LocationContext()
+
+    with _contexts_lock:
+        ctx = _contexts.get(session_id)
+        if ctx is None:
+            ctx = LocationContext()
+            _contexts[session_id] = ctx
+            while len(_contexts) > settings.LOCATION_CONTEXT_MAX_SESSIONS:
+                _contexts.popitem(last=False)
+        else:
+            _contexts.move_to_end(session_id)
+        return ctx
+
+
+def iter_location_summary(
+    lat: float,
+    lng: float,
+    session_id: Optional[str] = None
+) -> Iterator[Tuple[str, str]]:
+    """
+    위치 요약을 단계별로 생성 (스트리밍 응답용)
+
+    Yields:
+        ("region", 행정동 문장)  — 역지오코딩 직후
+        ("poi", 주요 시설 문장)  — 카테고리 검색 완료 후
+        ("done", 전체 요약 문장)
+    """
     ok, msg = _validate_coords(lat, lng)
     if not ok:
-        return msg
+        yield "done", msg
+        return
 
-    region_data = _reverse_geocode(lat, lng)
+    ctx = get_location_context(session_id)
+    region_data = ctx.reverse_geocode(lat, lng)
     region_text = _get_region_text(region_data)
-
-    pois = _gather_pois(lat, lng)
-    if not pois:
-        return f"현재 위치는 {region_text}으로, 주변에 안내할 주요 시설이 없습니다."
-
-    best = max(pois, key=lambda x: x["_score"])
-    return f"현재 위치는 {region_text}으로, {best['place_name']} 근처입니다."
-
-
-def get_full_address(lat: float, lng: float) -> str:
+    yield "region", f"현재 위치는 {region_text}입니다."
+
+    pois = ctx.gather_pois(lat, lng)
+    top = pois.top_k(lat, lng, k=1)
+    if not top:
+        yield "poi", "주변에 안내할 주요 시설이 없습니다."
+        yield "done", f"현재 위치는 {region_text}으로, 주변에 안내할 주요 시설이 없습니다."
+        return
+
+    best, _, _ = top[0]
+    yield "poi", f"{pois.names[best]} 근처입니다."
+    yield "done", f"현재 위치는 {region_text}으로, {pois.names[best]} 근처입니다."
+
+
+def get_location_summary(
+    lat: float,
+    lng: float,
+    session_id: Optional[str] = None
+) -> str:
+    msg = ""
+    for stage, text in iter_location_summary(lat, lng, session_id):
+        if stage == "done":
+            msg = text
+    return msg
+
+
+def get_full_address(
+    lat: float,
+    lng: float,
+    session_id: Optional[str] = None
+) -> str:
     ok, msg = _validate_coords(lat, lng)
     if not ok:
         return msg
 
-    data = _reverse_geocode(lat, lng)
+    data = get_location_context(session_id).reverse_geocode(lat, lng)
     road = data.get("road_address", {})
     addr = data.get("address", {})
 
@@ -201,25 +468,31 @@ def get_full_address(lat: float, lng: float) -> str:
     return "상세 주소를 불러올 수 없습니다."
 
 
-def get_nearest_landmark(lat: float, lng: float) -> str:
+def get_nearest_landmark(
+    lat: float,
+    lng: float,
+    session_id: Optional[str] = None
+) -> str:
     ok, msg = _validate_coords(lat, lng)
     if not ok:
         return msg
 
-    pois = _gather_pois(lat, lng)
-    buildings = [
-        p for p in pois
-        if any(k in p.get("place_name", "") for k in ["학교", "청", "구청", "시청", "센터"])
-    ]
+    pois = get_location_context(session_id).gather_pois(lat, lng)
+    top = pois.top_k(lat, lng, k=1, mask=pois.is_landmark)
 
-    if not buildings:
+    if not top:
         return "반경 약 800미터 이내에 주요 건물이 없습니다."
 
-    best = max(buildings, key=lambda x: x["_score"])
-    return f"{best['place_name']}이 약 {int(best['_distance'])}미터 앞에 있습니다."
+    best, dist, _ = top[0]
+    return f"{pois.names[best]}이 약 {int(dist)}미터 앞에 있습니다."
 
 
-def get_nearest_facility(lat: float, lng: float, category_code: str) -> str:
+def get_nearest_facility(
+    lat: float,
+    lng: float,
+    category_code: str,
+    session_id: Optional[str] = None
+) -> str:
     ok, msg = _validate_coords(lat, lng)
     if not ok:
         return msg
@@ -227,21 +500,13 @@ def get_nearest_facility(lat: float, lng: float, category_code: str) -> str:
     if category_code not in CATEGORIES:
         return "지원하지 않는 시설입니다."
 
-    pois, radius = _search_category(category_code, lat, lng)
-    valid = []
-
-    for p in pois:
-        s = _score_poi(
-            p,
-            lat,
-            lng,
-            PRIORITY.get(category_code, PRIORITY["DEFAULT"])
-        )
-        if s:
-            valid.append(s)
+    pois, radius = get_location_context(session_id).search_facility(
+        category_code, lat, lng
+    )
+    top = pois.top_k(lat, lng, k=1)
 
-    if not valid:
+    if not top:
         return f"반경 약 {radius}미터 이내에 {CATEGORIES[category_code]}이(가) 없습니다."
 
-    best = max(valid, key=lambda x: x["_score"])
-    return f"{best['place_name']}이 약 {int(best['_distance'])}미터 거리에 있습니다."
+    best, dist, _ = top[0]
+    return f"{pois.names[best]}이 약 {int(dist)}미터 거리에 있습니다."
@@ -1,10 +1,16 @@
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, Tuple
 
 import torch
 import numpy as np
 
 from core.config import settings
+from core.stt import get_stt_backend, warmup_stt
+from core.track_history import TrackHistory
+from core.distance import estimate_distances
 from models.object_detector import ObjectDetector
 from models.env_segmenter import EnvSegmenter
 
@@ -17,7 +23,15 @@ logging.basicConfig(
 _object_detector: Optional[ObjectDetector] = None
 _env_segmenter: Optional[EnvSegmenter] = None
 
-_prev_objects: Dict[int, Dict[str, Any]] = {}  # id -> {"h": int, "center": (x, y)}
+# track id 별 최근 bbox 높이 / 중심 이력 (다중 프레임 직선 적합)
+_track_history = TrackHistory(
+    capacity=settings.TRACK_HISTORY_CAPACITY,
+    window=settings.TRACK_HISTORY_WINDOW,
+    max_gap=settings.TRACK_HISTORY_MAX_GAP_SEC,
+)
+
+_ready = threading.Event()
+_startup_metrics: Dict[str, Any] = {}
 
 
 def get_device() -> str:
@@ -28,40 +42,169 @@ def get_device() -> str:
     return "cpu"
 
 
-def load_models() -> None:
-    global _object_detector, _env_segmenter
-
-    device = get_device()
-    logging.info(f"Using device: {device}")
-
+def _load_object_detector(device: str) -> ObjectDetector:
     try:
-        _object_detector = ObjectDetector(
+        return ObjectDetector(
             weights_path=str(settings.OBJECT_DETECTOR_WEIGHTS),
             device=device,
             tracking=True
         )
     except Exception as e:
         logging.error(f"Object Detector load failed: {e}")
-        _object_detector = ObjectDetector(
+        return ObjectDetector(
             weights_path=None,
             device="cpu",
             dummy=True
         )
 
+
+def _load_env_segmenter(device: str) -> EnvSegmenter:
     try:
-        _env_segmenter = EnvSegmenter(
+        return EnvSegmenter(
             weights_path=str(settings.ENV_SEGMENTER_WEIGHTS),
             device=device
         )
     except Exception as e:
         logging.error(f"Env Segmenter load failed: {e}")
-        _env_segmenter = EnvSegmenter(
+        return EnvSegmenter(
             weights_path=None,
             device="cpu",
             dummy=True
         )
 
 
+def load_models() -> None:
+    global _object_detector, _env_segmenter
+
+    device = get_device()
+    logging.info(f"Using device: {device}")
+
+    _object_detector = _load_object_detector(device)
+    _env_segmenter = _load_env_segmenter(device)
+
+
+def _timed(fn, *args) -> Tuple[Any, float]:
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, round((time.perf_counter() - t0) * 1000, 2)
+
+
+def _timed_safe(name: str, fn, *args) -> Tuple[Any, float]:
+    """_timed + 실패 기록 (예외 시 (None, -1.0)) — 한 모델 실패가 다른 모델 준비를 막지 않음"""
+    try:
+        return _timed(fn, *args)
+    except Exception as e:
+        logging.error(f"{name} preload failed: {e}")
+        return None, -1.0
+
+
+def preload_models() -> Dict[str, Any]:
+    """
+    서버 시작 단계: 세 모델(객체 / 환경 / STT) 로딩 + 더미 warm-up
+
+    - MODEL_PRELOAD_PARALLEL: 모델 로딩 병렬 수행
+    - MODEL_WARMUP_RUNS: 모델별 더미 추론 횟수 (0이면 생략)
+    - 로딩 / warm-up 실패는 모델별로 기록 (startup metrics 의 failed)
+      → 객체 / 환경 모델은 dummy 로 대체, STT 실패는 /api/stt 첫 호출 시 다시 로딩
+    - 완료 후 (실패 여부와 관계없이) is_ready() == True
+    """
+    global _object_detector, _env_segmenter
+
+    t_start = time.perf_counter()
+    device = get_device()
+    logging.info(f"Using device: {device}")
+
+    loaders = {
+        "object_detector": (_load_object_detector, device),
+        "env_segmenter": (_load_env_segmenter, device),
+        "stt": (get_stt_backend,),
+    }
+
+    loaded: Dict[str, Any] = {}
+    load_ms: Dict[str, float] = {}
+    warmup_ms: Dict[str, float] = {}
+    failed = []
+    runs = settings.MODEL_WARMUP_RUNS
+
+    try:
+        if settings.MODEL_PRELOAD_PARALLEL:
+            with ThreadPoolExecutor(max_workers=len(loaders)) as pool:
+                futures = {
+                    name: pool.submit(_timed_safe, name, fn, *args)
+                    for name, (fn, *args) in loaders.items()
+                }
+                for name, fut in futures.items():
+                    loaded[name], load_ms[name] = fut.result()
+        else:
+            for name, (fn, *args) in loaders.items():
+                loaded[name], load_ms[name] = _timed_safe(name, fn, *args)
+
+        # None: 로딩 예외 / dummy: 가중치 로딩 실패 후 dummy 로 대체됨
+        failed = [
+            name for name, model in loaded.items()
+            if model is None or getattr(model, "dummy", False)
+        ]
+
+        _object_detector = loaded["object_detector"]
+        _env_segmenter = loaded["env_segmenter"]
+
+        # 첫 프레임이 그래프 / 커널 초기화 비용을 치르지 않도록 더미 추론
+        h, w = settings.WARMUP_IMAGE_SIZE
+        dummy_image = np.zeros((h, w, 3), dtype=np.uint8)
+
+        warmups = {
+            "object_detector": lambda: _object_detector.warmup(dummy_image, runs),
+            "env_segmenter": lambda: _env_segmenter.warmup(dummy_image, runs),
+            "stt": lambda: warmup_stt(runs),
+        }
+
+        if runs > 0:
+            for name, fn in warmups.items():
+                if loaded[name] is None:
+                    continue
+                try:
+                    _, warmup_ms[name] = _timed(fn)
+                except Exception as e:
+                    logging.error(f"{name} warm-up failed: {e}")
+                    warmup_ms[name] = -1.0
+                    failed.append(name)
+
+    except Exception as e:
+        logging.error(f"Model preload failed: {e}")
+
+    finally:
+        # 로딩 실패 / 예외 시에도 추론 경로는 dummy 모델로 응답
+        if _object_detector is None:
+            _object_detector = ObjectDetector(weights_path=None, device="cpu", dummy=True)
+            failed.append("object_detector")
+        if _env_segmenter is None:
+            _env_segmenter = EnvSegmenter(weights_path=None, device="cpu", dummy=True)
+            failed.append("env_segmenter")
+
+        _startup_metrics.update({
+            "device": device,
+            "parallel": settings.MODEL_PRELOAD_PARALLEL,
+            "warmup_runs": runs,
+            "load_ms": load_ms,
+            "warmup_ms": warmup_ms,
+            "failed": sorted(set(failed)),
+            "total_ms": round((time.perf_counter() - t_start) * 1000, 2),
+        })
+        logging.warning(f"[STARTUP] {_startup_metrics}")
+
+        _ready.set()
+
+    return dict(_startup_metrics)
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def get_startup_metrics() -> Dict[str, Any]:
+    return dict(_startup_metrics)
+
+
 def get_object_detector() -> ObjectDetector:
     if _object_detector is None:
         raise RuntimeError("ObjectDetector not initialized. Call load_models() first.")
@@ -79,19 +222,29 @@ def bbox_center(bbox: Tuple[float, float, float, float]) -> Tuple[int, int]:
     return int((x1 + x2) / 2), int((y1 + y2) / 2)
 
 
-def run_full_inference(image_bgr: np.ndarray) -> Dict[str, Any]:
+def run_full_inference(
+    image_bgr: np.ndarray,
+    t_frame: Optional[float] = None,
+    camera_shift: Tuple[float, float] = (0.0, 0.0),
+) -> Dict[str, Any]:
     """
     tracking 기반 객체 추적 결과와 환경 인식 결과를 함께 반환
-    """
-    global _prev_objects
 
+    t_frame: 프레임 캡처 시각 (서버 monotonic 기준 초, 없으면 수신 시각)
+    camera_shift: 누적 카메라(화면) 이동 (x, y) — core.ego_motion
+      → 이력은 안정화 좌표로 저장, 적합 결과는 현재 프레임 좌표로 되돌림
+    """
     detector = get_object_detector()
     segmenter = get_env_segmenter()
 
+    if t_frame is None:
+        t_frame = time.monotonic()
+    shift_x = camera_shift[0]
     det_result = detector.predict(image_bgr, track=True) or {}
     objects = det_result.get("objects", []) or []
 
     enriched = []
+    slots = []
 
     for obj in objects:
         obj_id = obj.get("id")
@@ -106,23 +259,40 @@ def run_full_inference(image_bgr: np.ndarray) -> Dict[str, Any]:
         center = bbox_center(tuple(bbox))
         h = y2 - y1
 
-        prev = _prev_objects.get(obj_id)
-        prev_h = prev["h"] if prev else None
-        prev_center = prev["center"] if prev else None
-
-        _prev_objects[obj_id] = {"h": h, "center": center}
-
+        slots.append(_track_history.push(obj_id, t_frame, h, center[0] - shift_x))
         enriched.append({
             "id": obj_id,
             "class": cls_name,
             "score": score,
             "bbox": bbox,
-            "prev_h": prev_h,
-            "curr_h": h,
-            "prev_center": prev_center,
             "curr_center": center,
         })
 
+    # 단안 거리 추정 (클래스 높이 사전값 + 지면 가정, 전체 박스 일괄)
+    distances, upper_bounds = estimate_distances(
+        [item["bbox"] for item in enriched],
+        [item["class"] for item in enriched],
+        image_bgr.shape[1],
+        image_bgr.shape[0],
+    )
+    for item, d, upper in zip(enriched, distances, upper_bounds):
+        item["distance_m"] = round(float(d), 1)
+        item["distance_upper_bound"] = bool(upper)  # 하단이 잘린 박스 → distance_m 은 상한값
+
+    # 최근 표본 직선 적합 → 평활화된 이전(한 캡처 주기 전) / 현재 값
+    # 표본이 하나뿐인 track 은 이전 값 없음 (위험도 계산 제외)
+    if slots:
+        interval = settings.FRAME_INTERVAL_SEC
+        prev_h, curr_h, prev_x, curr_x, count = _track_history.fit(slots, interval)
+        for i, item in enumerate(enriched):
+            cy = item["curr_center"][1]
+            has_prev = count[i] >= 2
+            item["prev_h"] = float(prev_h[i]) if has_prev else None
+            item["curr_h"] = float(curr_h[i])
+            item["prev_center"] = (float(prev_x[i] + shift_x), cy) if has_prev else None
+            item["curr_center"] = (float(curr_x[i] + shift_x), cy)
+            item["dt"] = interval
+
     env: Dict[str, Any] = {}
     try:
         env_result = segmenter.predict(image_bgr)
@@ -1,4 +1,6 @@
-from typing import Dict, Any
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
 
 
 CLASS_WEIGHTS: Dict[str, float] = {
@@ -10,9 +12,17 @@ CLASS_WEIGHTS: Dict[str, float] = {
     "bicycle": 0.7,
 }
 
+# 프레임 객체 수가 이 값 이상일 때만 RiskBatch (NumPy 배열 생성 / 연산 고정 비용)
+# benchmarks/risk_bench.py 전체 루프 기준 손익분기 약 60개 → 그 미만은 객체별 scalar 계산이 빠름
+RISK_BATCH_MIN_OBJECTS = 64
+
 
-def compute_ttc(prev_h: float, curr_h: float) -> float:
-    """bbox 크기 변화 기반 TTC 근사"""
+def compute_ttc(prev_h: float, curr_h: float, dt: float = 1.0) -> float:
+    """
+    bbox 크기 변화 기반 TTC 근사 (초)
+
+    dt: prev_h → curr_h 사이 경과 시간 (초)
+    """
     if prev_h is None or curr_h is None or prev_h <= 0 or curr_h <= 0:
         return float("inf")
 
@@ -20,11 +30,11 @@ def compute_ttc(prev_h: float, curr_h: float) -> float:
     if dh <= 0:
         return float("inf")
 
-    return curr_h / dh
+    return curr_h / dh * dt
 
 
 def compute_Tr(ttc: float) -> float:
-    """TTC 기반 위험도 계수"""
+    """TTC(초) 기반 위험도 계수"""
     if ttc < 2.0:
         return 1.0
     elif ttc < 5.0:
@@ -73,12 +83,13 @@ def compute_risk(obj: Dict[str, Any]) -> Dict[str, Any]:
     prev_center = obj.get("prev_center")
     curr_center = obj.get("curr_center")
     frame_w = obj.get("frame_w", 0)
+    dt = obj.get("dt", 1.0)
 
     wc = CLASS_WEIGHTS.get(cls_name, 0.0)
 
     Da = compute_Da(prev_h, curr_h)
     Ad = compute_Ad(prev_center, curr_center, frame_w)
-    ttc = compute_ttc(prev_h, curr_h)
+    ttc = compute_ttc(prev_h, curr_h, dt)
     Tr = compute_Tr(ttc)
 
     R = wc * Da * Ad * Tr
@@ -93,3 +104,164 @@ def compute_risk(obj: Dict[str, Any]) -> Dict[str, Any]:
             "TTC": ttc,
         },
     }
+
+
+# ------------------------
+# 배치 계산 (프레임 내 전체 객체, NumPy 벡터 연산)
+# - 스칼라 함수와 동일한 분기 / 연산 순서 → 결과 동일
+# ------------------------
+def compute_ttc_np(prev_h: np.ndarray, curr_h: np.ndarray, dt: np.ndarray) -> np.ndarray:
+    dh = curr_h - prev_h
+    valid = (prev_h > 0) & (curr_h > 0) & (dh > 0)
+    ttc = np.divide(curr_h, dh, out=np.full_like(curr_h, np.inf), where=valid)
+    return np.where(valid, ttc * dt, np.inf)
+
+
+def compute_Tr_np(ttc: np.ndarray) -> np.ndarray:
+    return np.where(ttc < 2.0, 1.0, np.where(ttc < 5.0, 0.5, 0.0))
+
+
+def compute_Da_np(prev_h: np.ndarray, curr_h: np.ndarray, threshold: float = 0.05) -> np.ndarray:
+    valid = prev_h > 0
+    growth = np.divide(curr_h - prev_h, prev_h, out=np.zeros_like(curr_h), where=valid)
+    return np.where(valid & (growth >= threshold), 1.0, 0.0)
+
+
+def compute_Ad_np(prev_x: np.ndarray, curr_x: np.ndarray, frame_w: float) -> np.ndarray:
+    if frame_w is None or frame_w <= 0:
+        return np.zeros_like(curr_x)
+
+    half = frame_w / 2
+    toward_center = np.abs(curr_x - half) < np.abs(prev_x - half)
+    still = np.abs(curr_x - prev_x) < 5
+    return np.where(toward_center, 1.0, np.where(still, 0.3, 0.0))
+
+
+def compute_risk_batch(
+    prev_h: np.ndarray,
+    curr_h: np.ndarray,
+    prev_x: np.ndarray,
+    curr_x: np.ndarray,
+    wc: np.ndarray,
+    frame_w: float,
+    dt: np.ndarray = 1.0,
+) -> Dict[str, Any]:
+    """객체 N개 위험도 일괄 계산 (compute_risk 와 동일 결과, 값은 길이 N 배열)"""
+    Da = compute_Da_np(prev_h, curr_h)
+    Ad = compute_Ad_np(prev_x, curr_x, frame_w)
+    ttc = compute_ttc_np(prev_h, curr_h, dt)
+    Tr = compute_Tr_np(ttc)
+
+    R = wc * Da * Ad * Tr
+
+    return {
+        "risk_score": R,
+        "components": {
+            "Wc": wc,
+            "Da": Da,
+            "Ad": Ad,
+            "Tr": Tr,
+            "TTC": ttc,
+        },
+    }
+
+
+class RiskBatch:
+    """
+    추적 객체 열(column) 단위 묶음
+
+    - prev/curr 높이, 중심 x, 클래스 가중치, 경과 시간을 NumPy 배열로 보관
+    - 추적 정보가 빠진 객체(None 포함)는 제외
+    """
+
+    __slots__ = ("objects", "prev_h", "curr_h", "prev_x", "curr_x", "wc", "dt")
+
+    def __init__(self, objects, prev_h, curr_h, prev_x, curr_x, wc, dt):
+        self.objects: List[Dict[str, Any]] = list(objects)
+        self.prev_h = np.asarray(prev_h, dtype=np.float64)
+        self.curr_h = np.asarray(curr_h, dtype=np.float64)
+        self.prev_x = np.asarray(prev_x, dtype=np.float64)
+        self.curr_x = np.asarray(curr_x, dtype=np.float64)
+        self.wc = np.asarray(wc, dtype=np.float64)
+        self.dt = np.asarray(dt, dtype=np.float64)
+
+    @classmethod
+    def from_objects(cls, objects: Iterable[Dict[str, Any]]) -> "RiskBatch":
+        """탐지 결과(id, class, prev_h, curr_h, prev_center, curr_center, dt)로부터 배치 생성"""
+        kept, prev_h, curr_h, prev_x, curr_x, wc, dt = [], [], [], [], [], [], []
+
+        for obj in objects:
+            if not _is_tracked(obj):
+                continue
+            kept.append(obj)
+            prev_h.append(obj["prev_h"])
+            curr_h.append(obj["curr_h"])
+            prev_x.append(obj["prev_center"][0])
+            curr_x.append(obj["curr_center"][0])
+            wc.append(CLASS_WEIGHTS.get(obj["class"], 0.0))
+            dt.append(obj.get("dt", 1.0))
+
+        return cls(kept, prev_h, curr_h, prev_x, curr_x, wc, dt)
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def compute(self, frame_w: float) -> Dict[str, Any]:
+        return compute_risk_batch(
+            self.prev_h, self.curr_h, self.prev_x, self.curr_x, self.wc, frame_w, self.dt
+        )
+
+
+def _is_tracked(obj: Dict[str, Any]) -> bool:
+    return None not in (
+        obj.get("id"), obj.get("class"), obj.get("prev_h"),
+        obj.get("curr_h"), obj.get("prev_center"), obj.get("curr_center"),
+    )
+
+
+def compute_frame_risk(
+    objects: Iterable[Dict[str, Any]],
+    frame_w: float,
+    min_batch: int = RISK_BATCH_MIN_OBJECTS,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    프레임 내 추적 객체 위험도 (추적 정보가 빠진 객체 제외)
+
+    - 객체 수 < min_batch: 객체별 scalar 계산
+    - 객체 수 >= min_batch: RiskBatch 일괄 계산 후 list 변환 (객체별 조회 시 NumPy 원소 접근 비용 없음)
+    - 두 경로 결과 동일 → 반환값은 (계산된 객체 목록, compute_risk_batch 형식 dict, 값은 list)
+    """
+    objects = list(objects)
+    if len(objects) >= min_batch:
+        batch = RiskBatch.from_objects(objects)
+        risk = batch.compute(frame_w)
+        return batch.objects, {
+            "risk_score": risk["risk_score"].tolist(),
+            "components": {k: v.tolist() for k, v in risk["components"].items()},
+        }
+
+    kept = []
+    cols = {k: [] for k in ("Wc", "Da", "Ad", "Tr", "TTC")}
+    scores = []
+
+    for obj in objects:
+        if not _is_tracked(obj):
+            continue
+        prev_h, curr_h = obj["prev_h"], obj["curr_h"]
+
+        wc = CLASS_WEIGHTS.get(obj["class"], 0.0)
+        Da = compute_Da(prev_h, curr_h)
+        Ad = compute_Ad(obj["prev_center"], obj["curr_center"], frame_w)
+        ttc = compute_ttc(prev_h, curr_h, obj.get("dt", 1.0))
+        Tr = compute_Tr(ttc)
+
+        kept.append(obj)
+        scores.append(wc * Da * Ad * Tr)
+        cols["Wc"].append(wc)
+        cols["Da"].append(Da)
+        cols["Ad"].append(Ad)
+        cols["Tr"].append(Tr)
+        cols["TTC"].append(ttc)
+
+    return kept, {"risk_score": scores, "components": cols}
+
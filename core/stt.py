@@ -1,117 +1,432 @@
-import tempfile
-import os
+import io
+import logging
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
 import torch
 import whisper
 
-_model = None
-
-
-def get_whisper_model():
-    global _model
-    if _model is None:
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        _model = whisper.load_model("base", device=device)
-    return _model
-
-
-def _normalize_text(text: str) -> str:
-    t = text.strip().lower().replace(" ", "")
-
-    junk_words = [
-        "좀", "조금", "약간", "그냥", "이제", "지금", "요", "요?", "요.",
-        "거야", "거지", "인가요", "인가요?", "인가",
-        "해주세요", "해줘", "해주세요요", "좀요",
+from core.config import settings
+from core.intent import normalize_command, score_command
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _command_confidence(avg_logprob: float, no_speech_prob: float) -> float:
+    """토큰 평균 확률 exp(avg_logprob)에 무음 확률을 반영한 신뢰도 (0~1)"""
+    return float(np.exp(avg_logprob)) * (1.0 - float(no_speech_prob))
+
+
+class WhisperBackend:
+    """openai-whisper (PyTorch) 백엔드"""
+
+    name = "whisper"
+
+    def __init__(self, model_size: str, device: str, beam_size: int = 1):
+        self.model = whisper.load_model(model_size, device=device)
+        # beam_size 1 → 기존과 동일한 greedy 디코딩
+        self.decode_options = {"beam_size": beam_size} if beam_size > 1 else {}
+
+    def transcribe(self, audio) -> str:
+        """audio: 파일 경로 또는 16kHz float32 배열"""
+        result = self.model.transcribe(audio, language="ko", **self.decode_options)
+        return (result.get("text") or "").strip()
+
+    def transcribe_command(self, audio: np.ndarray, prompt: str, max_tokens: int):
+        """명령 어휘 prompt + 토큰 수 제한 단일 윈도우 디코딩 → (text, confidence)"""
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(audio), self.model.dims.n_mels
+        ).to(self.model.device)
+        options = whisper.DecodingOptions(
+            language="ko",
+            prompt=prompt,
+            sample_len=max_tokens,
+            without_timestamps=True,
+            fp16=self.model.device.type == "cuda",
+        )
+        result = whisper.decode(self.model, mel, options)
+        return result.text.strip(), _command_confidence(
+            result.avg_logprob, result.no_speech_prob
+        )
+
+
+class FasterWhisperBackend:
+    """faster-whisper (CTranslate2) 백엔드 — CPU INT8 양자화 지원"""
+
+    name = "faster_whisper"
+
+    def __init__(
+        self,
+        model_size: str,
+        device: str,
+        beam_size: int = 1,
+        compute_type: str = "int8",
+    ):
+        from faster_whisper import WhisperModel  # 선택 의존성
+
+        self.model = WhisperModel(model_size, device=device, compute_type=compute_type)
+        self.beam_size = beam_size
+
+    def transcribe(self, audio) -> str:
+        """audio: 파일 경로 또는 16kHz float32 배열"""
+        segments, _ = self.model.transcribe(
+            audio,
+            language="ko",
+            beam_size=self.beam_size,
+        )
+        return "".join(seg.text for seg in segments).strip()
+
+    def transcribe_command(self, audio: np.ndarray, prompt: str, max_tokens: int):
+        """명령 어휘 prompt + 토큰 수 제한 greedy 디코딩 → (text, confidence)"""
+        segments, _ = self.model.transcribe(
+            audio,
+            language="ko",
+            beam_size=1,
+            temperature=0.0,
+            initial_prompt=prompt,
+            without_timestamps=True,
+            condition_on_previous_text=False,
+            max_new_tokens=max_tokens,
+        )
+        segments = list(segments)
+        if not segments:
+            return "", 0.0
+
+        text = "".join(seg.text for seg in segments).strip()
+        avg_logprob = float(np.mean([seg.avg_logprob for seg in segments]))
+        no_speech_prob = max(seg.no_speech_prob for seg in segments)
+        return text, _command_confidence(avg_logprob, no_speech_prob)
+
+
+STT_BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def create_stt_backend(name: str):
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    if name == FasterWhisperBackend.name:
+        return FasterWhisperBackend(
+            settings.STT_MODEL_SIZE,
+            device=device,
+            beam_size=settings.STT_BEAM_SIZE,
+            compute_type=settings.STT_COMPUTE_TYPE,
+        )
+
+    return WhisperBackend(
+        settings.STT_MODEL_SIZE,
+        device=device,
+        beam_size=settings.STT_BEAM_SIZE,
+    )
+
+
+def get_stt_backend():
+    """
+    STT 백엔드 (최초 1회 로딩)
+    서버 시작 preload 와 /api/stt 첫 호출이 겹쳐도 모델은 한 번만 로딩 (lock)
+    """
+    global _backend
+    if _backend is not None:
+        return _backend
+
+    with _backend_lock:
+        if _backend is None:
+            name = settings.STT_BACKEND
+            if name not in STT_BACKENDS:
+                logger.error(f"[stt] 알 수 없는 STT_BACKEND={name}, whisper 사용")
+                name = WhisperBackend.name
+
+            try:
+                _backend = create_stt_backend(name)
+            except ImportError as e:
+                logger.error(f"[stt] {name} 백엔드 로드 실패, whisper 사용: {e}")
+                _backend = create_stt_backend(WhisperBackend.name)
+    return _backend
+
+
+def warmup_stt(runs: int = 1) -> None:
+    """무음 1초 더미 디코딩으로 첫 명령의 초기화 지연 제거"""
+    backend = get_stt_backend()
+    silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    for _ in range(runs):
+        backend.transcribe(silence)
+        if settings.STT_FAST_PATH:
+            backend.transcribe_command(
+                silence, COMMAND_PROMPT, settings.STT_FAST_PATH_MAX_TOKENS
+            )
+
+
+# 빠른 경로 prompt 편향용 명령 어휘 (core.intent.INTENT_RULES 의 대표 표현)
+# 각 표현은 score_command 로 의도한 intent 가 confidence 1.0 으로 나와야 함
+COMMAND_PHRASES = (
+    "시작해", "종료해", "멈춰",
+    "근처 객체 알려줘", "주변 뭐 있어",
+    "위험한 곳 알려줘", "안전한 곳 알려줘", "환경 안내",
+    "경고 그만", "경고 재개",
+    "위치 안내", "여기 어디야", "주소 알려줘", "주변 건물",
+    "편의시설", "병원", "약국", "편의점", "지하철역",
+    "천천히", "빠르게", "보통 속도",
+    "뒤로", "사진 분석", "다시 말해",
+)
+COMMAND_PROMPT = ", ".join(COMMAND_PHRASES) + "."
+
+
+def _decode_with_av(file_bytes: bytes) -> np.ndarray:
+    """PyAV(선택 의존성)로 프로세스 내 디코딩"""
+    import av
+
+    chunks = []
+    with av.open(io.BytesIO(file_bytes)) as container:
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+        for frame in container.decode(audio=0):
+            for out in resampler.resample(frame):
+                chunks.append(out.to_ndarray().reshape(-1))
+        for out in resampler.resample(None):
+            chunks.append(out.to_ndarray().reshape(-1))
+
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks).astype(np.float32) / 32768.0
+
+
+def _decode_with_ffmpeg_pipe(file_bytes: bytes) -> np.ndarray:
+    """ffmpeg stdin → stdout 파이프 디코딩 (임시 파일 없음)"""
+    cmd = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "pipe:1",
     ]
+    proc = subprocess.run(cmd, input=file_bytes, capture_output=True, check=True)
+    return np.frombuffer(proc.stdout, dtype=np.int16).astype(np.float32) / 32768.0
 
-    for j in junk_words:
-        t = t.replace(j, "")
-
-    return t
-
-
-def normalize_command(text: str) -> dict:
-    norm = _normalize_text(text)
-
-    def has(*words):
-        return any(w in norm for w in words)
-
-    if has("시작", "실행", "가동", "켜"):
-        return {"intent": "system_start", "raw": text, "norm": norm}
-
-    if has("종료", "끝내", "꺼", "중지", "멈춰"):
-        return {"intent": "system_stop", "raw": text, "norm": norm}
-
-    if has("객체", "물체", "뭐있어", "위험한거", "위험한게", "주변뭐", "사람있어", "차있어"):
-        return {"intent": "object_guide", "raw": text, "norm": norm}
-
-    if has("위험환경", "위험한곳", "위험해", "조심", "조심할"):
-        return {"intent": "env_danger", "raw": text, "norm": norm}
 
-    if has("안전환경", "안전해", "안전한곳"):
-        return {"intent": "env_safe", "raw": text, "norm": norm}
+def decode_audio(file_bytes: bytes) -> np.ndarray:
+    """
+    webm/opus 등 업로드 오디오 → 16kHz mono float32 배열
 
-    if has("환경안내", "환경메뉴", "주변환경"):
-        return {"intent": "env_menu", "raw": text, "norm": norm}
-
-    if has("경고꺼", "경고그만", "조용히", "그만말해", "알람꺼", "mute"):
-        return {"intent": "env_alert_off", "raw": text, "norm": norm}
-
-    if has("경고켜", "알람켜", "다시알려줘", "다시경고", "경고재개"):
-        return {"intent": "env_alert_on", "raw": text, "norm": norm}
+    PyAV 설치 시 프로세스 내 디코딩, 없으면 ffmpeg 파이프 사용
+    """
+    try:
+        return _decode_with_av(file_bytes)
+    except ImportError:
+        return _decode_with_ffmpeg_pipe(file_bytes)
 
-    if has("위치메뉴", "위치안내"):
-        return {"intent": "location_menu", "raw": text, "norm": norm}
 
-    if has("여기어디", "지금어디", "내위치", "현재위치"):
-        return {"intent": "location_summary", "raw": text, "norm": norm}
+def recognize_command(audio: np.ndarray) -> dict:
+    """
+    16kHz float32 오디오 → 명령 intent
 
-    if has("주소", "지번"):
-        return {"intent": "location_address", "raw": text, "norm": norm}
+    1) 빠른 경로: 명령 어휘 prompt 편향 + 짧은 토큰 제한 디코딩
+       신뢰도가 충분하고 intent 가 매칭되면 즉시 반환
+    2) 그 외: 전체 open-vocabulary 디코딩
+    """
+    if not audio.size:
+        return {"intent": "unknown", "raw": "", "norm": ""}
 
-    if has("주변건물", "건물", "무슨건물"):
-        return {"intent": "location_landmark", "raw": text, "norm": norm}
+    backend = get_stt_backend()
+
+    if settings.STT_FAST_PATH:
+        text, confidence = backend.transcribe_command(
+            audio, COMMAND_PROMPT, settings.STT_FAST_PATH_MAX_TOKENS
+        )
+        if text and confidence >= settings.STT_FAST_PATH_MIN_CONFIDENCE:
+            scored = score_command(text)
+            if (
+                scored["intent"] != "unknown"
+                and scored["confidence"] >= settings.STT_INTENT_MIN_CONFIDENCE
+            ):
+                return {k: scored[k] for k in ("intent", "raw", "norm")}
+        logger.debug(f"[stt] fast path miss: text={text!r} confidence={confidence:.2f}")
+
+    text = backend.transcribe(audio)
+    if not text:
+        return {"intent": "unknown", "raw": "", "norm": ""}
 
-    if has("편의시설", "생활시설", "시설", "병원", "약국", "마트", "편의점", "지하철", "역"):
-        return {"intent": "location_facility", "raw": text, "norm": norm}
+    return normalize_command(text)
 
-    if has("천천히", "느리게"):
-        return {"intent": "tts_slow", "raw": text, "norm": norm}
 
-    if has("빨리", "빠르게"):
-        return {"intent": "tts_fast", "raw": text, "norm": norm}
+def transcribe_audio_file(file_bytes: bytes) -> dict:
+    return recognize_command(decode_audio(file_bytes))
 
-    if has("보통속도", "기본속도", "원래대로"):
-        return {"intent": "tts_normal", "raw": text, "norm": norm}
 
-    if has("뒤로", "뒤로가기", "메인", "처음"):
-        return {"intent": "ui_back", "raw": text, "norm": norm}
+class SttBusyError(RuntimeError):
+    """STT 대기열이 가득 참 (클라이언트 재시도 필요)"""
 
-    if has("사진", "이미지", "찍어", "분석"):
-        return {"intent": "upload_image", "raw": text, "norm": norm}
 
-    if has("다시말해", "다시", "한번더"):
-        return {"intent": "repeat_last", "raw": text, "norm": norm}
+class SttWorkerPool:
+    """
+    STT 전용 작업 풀 (비전 추론 / 이벤트 루프와 분리)
 
-    return {"intent": "unknown", "raw": text, "norm": norm}
+    - 실행 중 + 대기 중 작업 수를 workers + max_queue 로 제한
+    - 한도 초과 시 즉시 SttBusyError (load shedding)
+    """
 
+    def __init__(self, workers: int, max_queue: int):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stt")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self.pending = 0
 
-def transcribe_audio_file(file_bytes: bytes, suffix: str = ".webm") -> dict:
-    model = get_whisper_model()
+    def submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise SttBusyError("STT queue is full")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as f:
-        f.write(file_bytes)
-        temp_path = f.name
+        with self._lock:
+            self.pending += 1
 
-    try:
-        result = model.transcribe(temp_path, language="ko")
-        text = (result.get("text") or "").strip()
-    finally:
         try:
-            os.remove(temp_path)
-        except OSError:
-            pass
-
-    if not text:
-        return {"intent": "unknown", "raw": "", "norm": ""}
-
-    return normalize_command(text)
+            fut = self._pool.submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+
+        fut.add_done_callback(self._release)
+        return fut
+
+    def _release(self, _):
+        with self._lock:
+            self.pending -= 1
+        self._slots.release()
+
+
+stt_pool = SttWorkerPool(
+    workers=settings.STT_WORKERS,
+    max_queue=settings.STT_MAX_QUEUE,
+)
+
+
+# ==================================================
+# 스트리밍 음성 명령 인식 (WebSocket + VAD)
+# ==================================================
+
+class EnergyVad:
+    """
+    프레임 RMS 에너지 기반 경량 VAD
+
+    - 무음 구간에서 잡음 레벨을 추적해 임계값을 자동 보정
+    - 발화 후 hangover_ms 동안 무음이면 발화 종료
+    """
+
+    def __init__(
+        self,
+        frame_ms: int = 20,
+        threshold: float = 0.01,
+        hangover_ms: int = 400,
+        min_speech_ms: int = 120,
+    ):
+        self.frame_len = SAMPLE_RATE * frame_ms // 1000
+        self.frame_ms = frame_ms
+        self.threshold = threshold
+        self.hangover_ms = hangover_ms
+        self.min_speech_ms = min_speech_ms
+
+        self.noise_floor = threshold / 3
+        self.speech_ms = 0
+        self.silence_ms = 0
+        self.started = False
+        self.ended = False
+        self._rest = np.zeros(0, dtype=np.float32)
+
+    def push(self, samples: np.ndarray) -> None:
+        samples = np.concatenate([self._rest, samples])
+        n = len(samples) // self.frame_len
+        self._rest = samples[n * self.frame_len:]
+        if n == 0 or self.ended:
+            return
+
+        frames = samples[: n * self.frame_len].reshape(n, self.frame_len)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+
+        for e in rms:
+            voiced = e > max(self.threshold, self.noise_floor * 3)
+
+            if voiced:
+                self.speech_ms += self.frame_ms
+                self.silence_ms = 0
+                if self.speech_ms >= self.min_speech_ms:
+                    self.started = True
+            else:
+                self.noise_floor = 0.95 * self.noise_floor + 0.05 * e
+                if self.started:
+                    self.silence_ms += self.frame_ms
+                    if self.silence_ms >= self.hangover_ms:
+                        self.ended = True
+                        return
+                else:
+                    self.speech_ms = 0
+
+
+class StreamingRecognizer:
+    """
+    오디오 청크(PCM16 mono 16kHz)를 누적하며 명령을 조기 인식
+
+    push() 결과
+    - None      : 계속 수신
+    - "partial" : 중간 디코딩 시점 (결과가 확실하면 조기 종료)
+    - "final"   : 발화 종료 / 최대 길이 도달 → 최종 디코딩
+    """
+
+    PRE_ROLL_MS = 300
+
+    def __init__(self):
+        self.vad = EnergyVad(
+            threshold=settings.STT_VAD_THRESHOLD,
+            hangover_ms=settings.STT_VAD_HANGOVER_MS,
+        )
+        self._chunks = []
+        self._samples = 0
+        self._decoded_at = 0
+        self._last_intent = None
+
+    @property
+    def duration_ms(self) -> int:
+        return self._samples * 1000 // SAMPLE_RATE
+
+    def push(self, pcm_bytes: bytes):
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+        self.vad.push(samples)
+
+        self._chunks.append(samples)
+        self._samples += len(samples)
+
+        if not self.vad.started:
+            # 발화 전에는 앞부분 일부만 유지
+            self._trim_pre_roll()
+            return None
+
+        if self.vad.ended or self.duration_ms >= settings.STT_STREAM_MAX_SEC * 1000:
+            return "final"
+
+        if self.duration_ms - self._decoded_at >= settings.STT_PARTIAL_INTERVAL_MS:
+            return "partial"
+
+        return None
+
+    def _trim_pre_roll(self) -> None:
+        keep = SAMPLE_RATE * self.PRE_ROLL_MS // 1000
+        while self._chunks and self._samples - len(self._chunks[0]) >= keep:
+            self._samples -= len(self._chunks.pop(0))
+
+    def decode(self) -> dict:
+        self._decoded_at = self.duration_ms
+        if not self._chunks:
+            return {"intent": "unknown", "raw": "", "norm": ""}
+
+        return recognize_command(np.concatenate(self._chunks))
+
+    def is_confident(self, result: dict) -> bool:
+        """연속 두 번의 중간 디코딩에서 같은 intent → 확정"""
+        intent = result.get("intent")
+        confident = intent != "unknown" and intent == self._last_intent
+        self._last_intent = intent
+        return confident
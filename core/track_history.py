@@ -0,0 +1,110 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class TrackHistory:
+    """
+    track id 별 고정 크기 ring buffer (시각, bbox 높이, 중심 x)
+
+    - (capacity, window) 사전 할당 배열 → 프레임마다 할당 없음
+    - 최근 window 개 표본에 최소제곱 직선 적합 (시간 단위)
+    - 적합 직선에서 "현재"와 "한 캡처 주기 전" 값을 읽어
+      기존 두 표본 기반 위험도 계산(core.risk)에 그대로 전달
+    """
+
+    def __init__(self, capacity: int, window: int, max_gap: float):
+        self.capacity = capacity
+        self.window = window
+        self.max_gap = max_gap
+
+        self.t = np.zeros((capacity, window), dtype=np.float64)
+        self.h = np.zeros((capacity, window), dtype=np.float64)
+        self.x = np.zeros((capacity, window), dtype=np.float64)
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.head = np.zeros(capacity, dtype=np.int64)
+        self.last_t = np.full(capacity, -np.inf)
+
+        self._slots: Dict[int, int] = {}
+        self._ids: List[Optional[int]] = [None] * capacity
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _slot(self, track_id: int) -> int:
+        slot = self._slots.get(track_id)
+        if slot is not None:
+            return slot
+
+        if self._free:
+            slot = self._free.pop()
+        else:
+            # 가득 찬 경우 가장 오래 보이지 않은 track 교체
+            slot = int(np.argmin(self.last_t))
+            del self._slots[self._ids[slot]]
+
+        self._slots[track_id] = slot
+        self._ids[slot] = track_id
+        self.count[slot] = 0
+        self.head[slot] = 0
+        return slot
+
+    def push(self, track_id: int, t: float, h: float, x: float) -> int:
+        """표본 추가 → slot 번호"""
+        slot = self._slot(track_id)
+
+        # 오래 끊긴 track (id 재사용 등) → 이전 표본 폐기
+        if t - self.last_t[slot] > self.max_gap:
+            self.count[slot] = 0
+            self.head[slot] = 0
+
+        i = self.head[slot]
+        self.t[slot, i] = t
+        self.h[slot, i] = h
+        self.x[slot, i] = x
+        self.head[slot] = (i + 1) % self.window
+        self.count[slot] = min(self.count[slot] + 1, self.window)
+        # 순서가 뒤바뀌어 도착한 프레임은 적합에만 반영 (기준 시각은 최신 유지)
+        self.last_t[slot] = max(self.last_t[slot], t)
+        return slot
+
+    def fit(
+        self,
+        slots: Sequence[int],
+        interval: float,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        slot 들의 직선 적합 결과 (prev_h, curr_h, prev_x, curr_x, count)
+
+        - curr_*: 마지막 표본 시각의 적합값
+        - prev_*: interval 초 이전 시각의 적합값
+        - count < 2 인 slot 은 기울기 0 (호출 측에서 이전 값 없음으로 처리)
+        """
+        slots = np.asarray(slots, dtype=np.int64)
+        n = self.count[slots]
+        w = (np.arange(self.window)[None, :] < n[:, None]).astype(np.float64)
+        nn = np.maximum(n, 1)
+
+        # 마지막 표본 기준 상대 시각 (≤ 0)
+        dt = (self.t[slots] - self.last_t[slots][:, None]) * w
+        h = self.h[slots] * w
+        x = self.x[slots] * w
+
+        t_mean = dt.sum(axis=1) / nn
+        h_mean = h.sum(axis=1) / nn
+        x_mean = x.sum(axis=1) / nn
+
+        dtc = (dt - t_mean[:, None]) * w
+        sxx = (dtc * dtc).sum(axis=1)
+        ok = sxx > 0
+
+        zeros = np.zeros(len(slots))
+        slope_h = np.divide((dtc * h).sum(axis=1), sxx, out=zeros.copy(), where=ok)
+        slope_x = np.divide((dtc * x).sum(axis=1), sxx, out=zeros.copy(), where=ok)
+
+        curr_h = h_mean - slope_h * t_mean
+        curr_x = x_mean - slope_x * t_mean
+        prev_h = curr_h - slope_h * interval
+        prev_x = curr_x - slope_x * interval
+        return prev_h, curr_h, prev_x, curr_x, n
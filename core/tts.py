@@ -1,3 +1,9 @@
+import sys
+from typing import Optional, Tuple
+
+from core.env_risk import DANGER_ZONES
+
+
 TTS_CLASS_MAP = {
     "barricade": "장애물",
     "bench": "벤치",
@@ -46,21 +52,146 @@ def add_particle(word: str) -> str:
     return word + ("이" if jong != 0 else "가")
 
 
-def get_direction(center_x: float, frame_w: int) -> str:
+DIRECTIONS = ("왼쪽", "정면", "오른쪽")
+DISTANCES = ("먼 곳", "가까운 곳")  # 환경 격자 행 (위쪽 = 먼 곳)
+DEFAULT_LABEL = "물체"
+
+
+def get_direction_index(center_x: float, frame_w: int) -> int:
+    """0: 왼쪽 / 1: 정면 / 2: 오른쪽"""
     if frame_w <= 0:
-        return "정면"
+        return 1
 
     ratio = center_x / frame_w
 
     if ratio < 1 / 3:
-        return "왼쪽"
+        return 0
     if ratio > 2 / 3:
-        return "오른쪽"
-    return "정면"
+        return 2
+    return 1
+
+
+def get_direction(center_x: float, frame_w: int) -> str:
+    return DIRECTIONS[get_direction_index(center_x, frame_w)]
+
+
+def _env_sentence(zone: str) -> str:
+    label = TTS_CLASS_MAP.get(zone, zone)
+    return f"{label} 환경입니다. 주의하세요."
+
+
+# 거리 안내 구간 (m) — 추정 거리를 가장 가까운 구간으로 반올림
+METER_BUCKETS = (1, 2, 3, 5, 7, 10, 15, 20)
+MAX_SPOKEN_DISTANCE_M = 25.0  # 이보다 멀거나 추정 불가 → 거리 생략
+
+
+def get_distance_bucket(distance_m: Optional[float]) -> int:
+    """0: 거리 생략 / i: METER_BUCKETS[i - 1]"""
+    if distance_m is None or not (0 < distance_m <= MAX_SPOKEN_DISTANCE_M):
+        return 0
+    return 1 + min(range(len(METER_BUCKETS)), key=lambda i: abs(METER_BUCKETS[i] - distance_m))
+
+
+def _object_sentence(label: str, direction: str, bucket: int) -> str:
+    if bucket == 0:
+        return f"{direction}에서 {add_particle(label)} 다가오고 있습니다."
+    return f"{direction} 약 {METER_BUCKETS[bucket - 1]}미터 거리에서 {add_particle(label)} 다가오고 있습니다."
+
+
+# ------------------------
+# 경고 문장 사전 생성 표
+# (라벨 × 방향 × 거리 구간) 객체 경고 + 위험 환경 경고, 정수 message id 로 조회
+# ------------------------
+_N_BUCKETS = 1 + len(METER_BUCKETS)
+_PER_LABEL = len(DIRECTIONS) * _N_BUCKETS
+
+_LABELS = tuple(dict.fromkeys(list(TTS_CLASS_MAP.values()) + [DEFAULT_LABEL]))
+_LABEL_INDEX = {label: i for i, label in enumerate(_LABELS)}
+_CLASS_BASE = {cls: _LABEL_INDEX[label] * _PER_LABEL for cls, label in TTS_CLASS_MAP.items()}
+_DEFAULT_BASE = _LABEL_INDEX[DEFAULT_LABEL] * _PER_LABEL
+
+WARNING_MESSAGES = tuple(
+    sys.intern(_object_sentence(label, direction, bucket))
+    for label in _LABELS
+    for direction in DIRECTIONS
+    for bucket in range(_N_BUCKETS)
+) + tuple(sys.intern(_env_sentence(zone)) for zone in DANGER_ZONES)
+
+_ENV_ID = {
+    zone: len(_LABELS) * _PER_LABEL + i
+    for i, zone in enumerate(DANGER_ZONES)
+}
+
+_MESSAGE_ID = {text: i for i, text in enumerate(WARNING_MESSAGES)}
+
+
+def build_warning(
+    cls_name: str,
+    center_x: float,
+    frame_w: int,
+    distance_m: Optional[float] = None,
+) -> Tuple[int, str]:
+    """객체 경고 (message id, 문장) — distance_m 이 있으면 "약 N미터" 포함"""
+    msg_id = (
+        _CLASS_BASE.get(cls_name, _DEFAULT_BASE)
+        + get_direction_index(center_x, frame_w) * _N_BUCKETS
+        + get_distance_bucket(distance_m)
+    )
+    return msg_id, WARNING_MESSAGES[msg_id]
+
+
+def build_warning_message(
+    cls_name: str,
+    center_x: float,
+    frame_w: int,
+    distance_m: Optional[float] = None,
+) -> str:
+    return build_warning(cls_name, center_x, frame_w, distance_m)[1]
+
+
+def build_env_warning(zone: str) -> Tuple[int, str]:
+    """환경 경고 (message id, 문장) — 표에 없는 구역은 id -1"""
+    msg_id = _ENV_ID.get(zone)
+    if msg_id is None:
+        return -1, _env_sentence(zone)
+    return msg_id, WARNING_MESSAGES[msg_id]
+
+
+def build_env_warning_message(zone: str) -> str:
+    return build_env_warning(zone)[1]
+
+
+def build_env_position_message(zone: str, cell: Optional[Tuple[int, int]] = None) -> str:
+    """수동 환경 안내 문장 (cell: env_risk.locate_zone 결과, 없으면 정면)"""
+    label = add_particle(TTS_CLASS_MAP.get(zone, zone))
+    if cell is None:
+        return f"현재 정면에 {label} 있습니다."
+
+    col, row = cell
+    return f"현재 {DIRECTIONS[col]} {DISTANCES[row]}에 {label} 있습니다."
+
+
+def get_warning_message(msg_id: int) -> Optional[str]:
+    if 0 <= msg_id < len(WARNING_MESSAGES):
+        return WARNING_MESSAGES[msg_id]
+    return None
+
+
+def find_warning_message(text: str) -> Optional[int]:
+    """문장 → message id (표에 없는 문장은 None)"""
+    return _MESSAGE_ID.get(text)
+
+
+def iter_warning_messages():
+    """자동 경고로 나올 수 있는 모든 문장"""
+    return iter(WARNING_MESSAGES)
 
 
-def build_warning_message(cls_name: str, center_x: float, frame_w: int) -> str:
-    label = TTS_CLASS_MAP.get(cls_name, "물체")
-    label = add_particle(label)
-    direction = get_direction(center_x, frame_w)
-    return f"{direction}에서 {label} 다가오고 있습니다."
+def iter_base_warning_messages():
+    """
+    서버 TTS 우선 사전 합성 대상 (거리 생략 객체 경고 + 환경 경고)
+    나머지(거리 포함) 문장은 이후 iter_warning_messages 순회에서 합성
+    """
+    for base in range(0, len(_LABELS) * _PER_LABEL, _N_BUCKETS):
+        yield WARNING_MESSAGES[base]
+    yield from (WARNING_MESSAGES[i] for i in _ENV_ID.values())
@@ -0,0 +1,170 @@
+import hashlib
+import logging
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+from core.config import settings
+from core.tts import get_warning_message, iter_base_warning_messages, iter_warning_messages
+
+logger = logging.getLogger(__name__)
+
+
+class LocalTtsEngine:
+    """
+    로컬 TTS 엔진 (espeak-ng → ffmpeg Opus 인코딩)
+
+    - 외부 네트워크 없이 서버에서 합성
+    - 결과: Ogg/Opus 바이트
+    """
+
+    name = "espeak-ng"
+
+    def __init__(self, voice: str, rate_wpm: int, bitrate: str = "24k"):
+        self.voice = voice
+        self.rate_wpm = rate_wpm
+        self.bitrate = bitrate
+
+    @property
+    def signature(self) -> str:
+        """캐시 키에 포함되는 엔진 설정"""
+        return f"{self.name}|{self.voice}|{self.rate_wpm}|{self.bitrate}"
+
+    def synthesize(self, text: str) -> bytes:
+        wav = subprocess.run(
+            ["espeak-ng", "-v", self.voice, "-s", str(self.rate_wpm), "--stdout", text],
+            capture_output=True,
+            check=True,
+        ).stdout
+
+        return subprocess.run(
+            [
+                "ffmpeg", "-hide_banner", "-loglevel", "error",
+                "-i", "pipe:0",
+                "-c:a", "libopus", "-b:a", self.bitrate,
+                "-f", "ogg", "pipe:1",
+            ],
+            input=wav,
+            capture_output=True,
+            check=True,
+        ).stdout
+
+
+class PhraseAudioCache:
+    """
+    문장 → 음성 클립 content-addressed 캐시
+
+    - 키: sha256(엔진 설정 + 문장)
+    - 디스크(CACHE_DIR/tts) 저장 → 재시작 / 워커 간 재사용
+    - 동일 문장 동시 합성은 한 번만 수행
+    """
+
+    def __init__(self, engine: LocalTtsEngine, root: Path):
+        self.engine = engine
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._message_keys = {}  # message id -> 클립 키
+
+    def key(self, text: str) -> str:
+        raw = f"{self.engine.signature}|{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.root / f"{key}.ogg"
+
+    def get(self, key: str) -> Optional[bytes]:
+        p = self.path(key)
+        return p.read_bytes() if p.exists() else None
+
+    def get_or_synthesize(self, text: str) -> str:
+        """문장 합성(캐시 미스 시) 후 키 반환"""
+        key = self.key(text)
+        p = self.path(key)
+        if p.exists():
+            return key
+
+        with self._locks_guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        with lock:
+            if not p.exists():
+                audio = self.engine.synthesize(text)
+                tmp = p.with_suffix(".tmp")
+                tmp.write_bytes(audio)
+                tmp.replace(p)
+
+        with self._locks_guard:
+            self._locks.pop(key, None)
+        return key
+
+    def get_or_synthesize_message(self, msg_id: int) -> Optional[str]:
+        """경고 message id → 클립 키 (표에 없는 id 는 None)"""
+        key = self._message_keys.get(msg_id)
+        if key is not None:
+            return key
+
+        text = get_warning_message(msg_id)
+        if text is None:
+            return None
+
+        key = self.get_or_synthesize(text)
+        self._message_keys[msg_id] = key
+        return key
+
+    def warm(self, phrases: Iterable[str]) -> int:
+        """문장 목록 사전 합성 → 새로 합성한 개수"""
+        created = 0
+        for text in phrases:
+            if self.path(self.key(text)).exists():
+                continue
+            try:
+                self.get_or_synthesize(text)
+                created += 1
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.error(f"[tts_engine] 사전 합성 실패 ({text}): {e}")
+                break
+        return created
+
+
+_phrase_cache: Optional[PhraseAudioCache] = None
+
+
+def get_phrase_cache() -> Optional[PhraseAudioCache]:
+    """TTS_ENGINE 미설정 시 None (서버 TTS 비활성)"""
+    global _phrase_cache
+    if _phrase_cache is None and settings.TTS_ENGINE == LocalTtsEngine.name:
+        engine = LocalTtsEngine(
+            voice=settings.TTS_VOICE,
+            rate_wpm=settings.TTS_RATE_WPM,
+        )
+        _phrase_cache = PhraseAudioCache(engine, settings.CACHE_DIR / "tts")
+    return _phrase_cache
+
+
+def warm_warning_phrases() -> None:
+    """
+    모델 준비 후 경고 문장 전체 사전 합성 (서버 TTS 활성 시, 백그라운드 스레드)
+    1) 기본 문장 (거리 생략 객체 경고 + 환경 경고) 먼저
+    2) 나머지 거리 포함 문장
+    - 디스크 content-addressed 캐시 → 최초 1회 비용, 재시작 시 이미 있는 문장은 건너뜀
+    - 합성 완료 전 요청된 문장은 message id 첫 요청 시 합성
+    """
+    cache = get_phrase_cache()
+    if cache is None:
+        return
+
+    stages = (
+        ("기본", iter_base_warning_messages),
+        ("전체", iter_warning_messages),
+    )
+    for stage, phrases in stages:
+        t0 = time.perf_counter()
+        created = cache.warm(phrases())
+        logger.warning(
+            f"[tts_engine] 경고 문장 사전 합성 ({stage}) {created}건 "
+            f"({(time.perf_counter() - t0) * 1000:.0f}ms)"
+        )
@@ -3,7 +3,8 @@ import numpy as np
 from typing import List, Tuple, Dict, Any
 
 
-RISK_DISTANCE_THRESHOLD = 0.25  # bbox 높이 / 프레임 높이 비율
+RISK_DISTANCE_THRESHOLD = 0.25  # bbox 높이 / 프레임 높이 비율 (거리 추정값 없을 때)
+RISK_DISTANCE_M = 5.0           # 추정 거리 기준 (core.distance)
 
 
 def is_close_enough(box: Tuple[float, float, float, float], frame_h: int):
@@ -32,7 +33,11 @@ def draw_detections(frame: np.ndarray, objects: List[Dict[str, Any]]) -> np.ndar
 
         x1, y1, x2, y2 = map(int, bbox)
 
-        is_risk, ratio = is_close_enough((x1, y1, x2, y2), h)
+        distance = obj.get("distance_m")
+        if distance is not None:
+            is_risk = distance < RISK_DISTANCE_M
+        else:
+            is_risk, _ = is_close_enough((x1, y1, x2, y2), h)
 
         if is_risk:
             color = (0, 0, 255)
@@ -42,6 +47,9 @@ def draw_detections(frame: np.ndarray, objects: List[Dict[str, Any]]) -> np.ndar
             extra = ""
 
         label = f"{cls} {conf:.2f}{extra}"
+        if distance is not None:
+            bound = "<" if obj.get("distance_upper_bound") else ""
+            label += f" {bound}{distance:.1f}m"
 
         cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
 
@@ -1,16 +1,26 @@
+import heapq
+import itertools
+import math
 import time
-from enum import Enum
-from typing import Dict, List
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional, Tuple
 
+from core.distance import ranking_distance
 from core.tts import TTS_CLASS_MAP
 
 
-class ObjectState(Enum):
+class ObjectState(IntEnum):
     SAFE = 0
     NEARBY = 1
     APPROACHING = 2
 
 
+# 프레임마다 비교하는 상태 값은 정수 상수로 사용 (Enum 속성 조회 없음)
+SAFE = int(ObjectState.SAFE)
+NEARBY = int(ObjectState.NEARBY)
+APPROACHING = int(ObjectState.APPROACHING)
+
+
 APPROACH_CONFIRM_TIME = 0.8
 LEAVE_CONFIRM_TIME = 1.2
 EXPIRE_TIME = 2.0
@@ -22,14 +32,27 @@ ENV_WARN_COOLDOWN = 10.0
 
 
 class TrackedObject:
-    def __init__(self, obj_id, cls_name):
+    __slots__ = (
+        "id", "cls", "label", "state",
+        "distance_m", "distance_upper_bound", "direction", "height", "risk",
+        "first_seen", "last_seen",
+        "approach_since", "leave_since", "last_warned",
+    )
+
+    def __init__(self, obj_id, cls_name, now: float):
         self.id = obj_id
         self.cls = cls_name
+        self.label = TTS_CLASS_MAP.get(cls_name, cls_name)  # 음성 안내용 한글 이름
 
-        self.state = ObjectState.NEARBY
+        self.state = NEARBY
+        self.distance_m = None  # 최근 추정 거리 (m, core.distance)
+        self.distance_upper_bound = False  # 하단이 잘린 박스 → distance_m 은 상한값
+        self.direction = 1      # 0: 왼쪽 / 1: 정면 / 2: 오른쪽 (core.tts.DIRECTIONS)
+        self.height = 0.0       # 최근 bbox 높이 (px)
+        self.risk = 0.0         # 최근 위험도 (core.risk, 0~1)
 
-        self.first_seen = time.time()
-        self.last_seen = time.time()
+        self.first_seen = now
+        self.last_seen = now
 
         self.approach_since = None
         self.leave_since = None
@@ -37,9 +60,146 @@ class TrackedObject:
         self.last_warned = None
 
 
-class WarningManager:
+def proximity_key(
+    distance_m: Optional[float], risk: float, upper_bound: bool = False
+) -> Tuple[float, float]:
+    """
+    근접 순위 키 (작을수록 먼저 안내)
+    - 위험도만큼 거리를 줄여 본 유효 거리 (위험도 1 → 거리 절반)
+    - 거리가 상한값(하단이 잘린 박스)이면 맨 앞
+    - 거리 추정값이 없으면 맨 뒤, 같은 유효 거리는 위험도 높은 순
+    """
+    distance_m = ranking_distance(distance_m, upper_bound)
+    if distance_m is None:
+        return (math.inf, -risk)
+    return (distance_m / (1.0 + risk), -risk)
+
+
+class NearestIndex:
+    """
+    객체 id 별 위치를 기억하는 binary min-heap
+    - update / remove: O(log n) (키가 바뀐 항목만 sift)
+    - smallest(k): 루트부터 후보 heap 으로 탐색 → O(k log k), 전체 정렬 없음
+    - 크기는 추적 중인 객체 수 (만료 시 remove)
+    """
+
+    __slots__ = ("_keys", "_ids", "_pos")
+
     def __init__(self):
+        self._keys: List[Tuple[float, float]] = []
+        self._ids: List[int] = []
+        self._pos: Dict[int, int] = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _swap(self, i: int, j: int):
+        keys, ids = self._keys, self._ids
+        keys[i], keys[j] = keys[j], keys[i]
+        ids[i], ids[j] = ids[j], ids[i]
+        self._pos[ids[i]] = i
+        self._pos[ids[j]] = j
+
+    def _sift_up(self, i: int):
+        keys = self._keys
+        while i > 0:
+            parent = (i - 1) >> 1
+            if keys[i] >= keys[parent]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int):
+        keys = self._keys
+        n = len(keys)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and keys[child] < keys[smallest]:
+                    smallest = child
+            if smallest == i:
+                break
+            self._swap(i, smallest)
+            i = smallest
+
+    def update(self, item_id: int, key: Tuple[float, float]):
+        i = self._pos.get(item_id)
+        if i is None:
+            i = len(self._ids)
+            self._keys.append(key)
+            self._ids.append(item_id)
+            self._pos[item_id] = i
+            self._sift_up(i)
+            return
+
+        old = self._keys[i]
+        self._keys[i] = key
+        if key < old:
+            self._sift_up(i)
+        elif key > old:
+            self._sift_down(i)
+
+    def remove(self, item_id: int):
+        i = self._pos.pop(item_id, None)
+        if i is None:
+            return
+
+        last = len(self._ids) - 1
+        if i != last:
+            self._keys[i] = self._keys[last]
+            self._ids[i] = self._ids[last]
+            self._pos[self._ids[i]] = i
+        self._keys.pop()
+        self._ids.pop()
+
+        if i < len(self._ids):
+            self._sift_up(i)
+            self._sift_down(i)
+
+    def smallest(self, k: int) -> List[int]:
+        """키가 작은 순서로 id k개"""
+        keys, ids = self._keys, self._ids
+        n = len(keys)
+        out: List[int] = []
+        if k <= 0 or n == 0:
+            return out
+
+        frontier = [(keys[0], 0)]
+        while frontier and len(out) < k:
+            _, i = heapq.heappop(frontier)
+            out.append(ids[i])
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n:
+                    heapq.heappush(frontier, (keys[child], child))
+        return out
+
+    def clear(self):
+        self._keys.clear()
+        self._ids.clear()
+        self._pos.clear()
+
+
+class WarningManager:
+    """
+    객체 / 환경 경고 상태 머신
+
+    - clock: 단조 증가 시각 함수 (기본 time.monotonic, 오프라인 재생 시 가상 시계 주입)
+    - 객체 만료: (만료 예정 시각, 객체) min-heap
+      → cleanup 은 만료 예정 시각이 지난 항목만 확인 (전체 순회 없음)
+    - 조회용 상태는 변경 시점에만 갱신
+      - 접근 중 객체 이름 목록: 상태 전이 / 만료 시에만 다시 구성
+      - 근접 순위: 객체별 (유효 거리, 위험도) 키의 NearestIndex, 프레임마다 O(log n) 갱신
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+
         self.objects: Dict[int, TrackedObject] = {}
+        self._approaching: Dict[int, str] = {}  # obj_id -> label
+        self._active_labels: Optional[Tuple[str, ...]] = ()
+        self._nearest = NearestIndex()
+        self._expiry: List[Tuple[float, int, TrackedObject]] = []
+        self._seq = itertools.count()
 
         self.env_last_warned: Dict[str, float] = {}
         self.env_muted = set()
@@ -49,45 +209,74 @@ class WarningManager:
         self.global_last_warned: float | None = None
 
 
-    def update_object(self, obj_id, cls_name, is_approaching):
-        now = time.time()
+    def _schedule_expiry(self, obj: TrackedObject):
+        heapq.heappush(
+            self._expiry,
+            (obj.last_seen + EXPIRE_TIME, next(self._seq), obj)
+        )
 
-        if obj_id not in self.objects:
-            self.objects[obj_id] = TrackedObject(obj_id, cls_name)
 
-        obj = self.objects[obj_id]
-        obj.last_seen = now
+    def update_object(
+        self, obj_id, cls_name, is_approaching, distance_m=None,
+        direction: int = 1, height: float = 0.0, risk: float = 0.0,
+        distance_upper_bound: bool = False,
+    ):
+        now = self.clock()
+
+        obj = self.objects.get(obj_id)
+        if obj is None:
+            obj = TrackedObject(obj_id, cls_name, now)
+            self.objects[obj_id] = obj
+            self._schedule_expiry(obj)
 
-        if obj.state == ObjectState.NEARBY:
+        obj.last_seen = now
+        obj.distance_m = distance_m
+        obj.distance_upper_bound = distance_upper_bound
+        obj.direction = direction
+        obj.height = height
+        obj.risk = risk
+        self._nearest.update(obj_id, proximity_key(distance_m, risk, distance_upper_bound))
+
+        if obj.state == NEARBY:
             if is_approaching:
                 if obj.approach_since is None:
                     obj.approach_since = now
                 elif now - obj.approach_since >= APPROACH_CONFIRM_TIME:
-                    obj.state = ObjectState.APPROACHING
+                    obj.state = APPROACHING
                     obj.approach_since = None
                     obj.leave_since = None
+                    self._set_approaching(obj, True)
                     return obj
             else:
                 obj.approach_since = None
 
-        elif obj.state == ObjectState.APPROACHING:
+        elif obj.state == APPROACHING:
             if not is_approaching:
                 if obj.leave_since is None:
                     obj.leave_since = now
                 elif now - obj.leave_since >= LEAVE_CONFIRM_TIME:
-                    obj.state = ObjectState.NEARBY
+                    obj.state = NEARBY
                     obj.leave_since = None
+                    self._set_approaching(obj, False)
             else:
                 obj.leave_since = None
 
         return None
 
 
+    def _set_approaching(self, obj: TrackedObject, approaching: bool):
+        if approaching:
+            self._approaching[obj.id] = obj.label
+        elif self._approaching.pop(obj.id, None) is None:
+            return
+        self._active_labels = None
+
+
     def should_warn(self, obj: TrackedObject) -> bool:
-        if obj.state != ObjectState.APPROACHING:
+        if obj.state != APPROACHING:
             return False
 
-        now = time.time()
+        now = self.clock()
 
         if obj.last_warned is None:
             obj.last_warned = now
@@ -101,7 +290,7 @@ class WarningManager:
 
 
     def can_global_warn(self) -> bool:
-        now = time.time()
+        now = self.clock()
 
         if self.global_last_warned is None:
             self.global_last_warned = now
@@ -115,26 +304,37 @@ class WarningManager:
 
 
     def cleanup(self):
-        now = time.time()
-        expired = [
-            k for k, v in self.objects.items()
-            if now - v.last_seen >= EXPIRE_TIME
-        ]
-        for k in expired:
-            del self.objects[k]
+        """
+        만료 예정 시각이 지난 heap 항목만 확인
+        - 그 사이 다시 관측된 객체 → 새 만료 시각으로 재등록
+        - 이미 제거 / 교체된 객체 항목 → 무시
+        """
+        now = self.clock()
+        heap = self._expiry
+
+        while heap and heap[0][0] <= now:
+            _, _, obj = heapq.heappop(heap)
+            if self.objects.get(obj.id) is not obj:
+                continue
+
+            if now - obj.last_seen >= EXPIRE_TIME:
+                del self.objects[obj.id]
+                self._nearest.remove(obj.id)
+                self._set_approaching(obj, False)
+            else:
+                self._schedule_expiry(obj)
 
 
-    def get_all_objects(self) -> List[TrackedObject]:
-        return list(self.objects.values())
+    def get_nearest_objects(self, k: int) -> List[TrackedObject]:
+        """유효 거리(거리 / (1 + 위험도))가 가까운 객체 k개 (가까운 순)"""
+        return [self.objects[i] for i in self._nearest.smallest(k)]
 
 
-    def get_active_warnings(self) -> List[str]:
-        result = []
-        for obj in self.objects.values():
-            if obj.state == ObjectState.APPROACHING:
-                label = TTS_CLASS_MAP.get(obj.cls, obj.cls)
-                result.append(label)
-        return result
+    def get_active_warnings(self) -> Tuple[str, ...]:
+        """접근 중 객체 이름 목록 (변경 시에만 다시 구성)"""
+        if self._active_labels is None:
+            self._active_labels = tuple(self._approaching.values())
+        return self._active_labels
 
 
     def should_env_warn(self, zone_name: str) -> bool:
@@ -144,7 +344,7 @@ class WarningManager:
         if zone_name in self.env_muted:
             return False
 
-        now = time.time()
+        now = self.clock()
         last = self.env_last_warned.get(zone_name)
 
         if last is None or (now - last) >= ENV_WARN_COOLDOWN:
@@ -172,6 +372,10 @@ class WarningManager:
 
     def reset_all(self):
         self.objects.clear()
+        self._expiry.clear()
+        self._nearest.clear()
+        self._approaching.clear()
+        self._active_labels = ()
         self.env_last_warned.clear()
         self.env_muted.clear()
         self.last_env.clear()
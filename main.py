@@ -6,12 +6,15 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
+import threading
 from pathlib import Path
 
 from core.config import settings
-from core.model_manager import load_models
+from core.model_manager import preload_models
+from core.tts_engine import warm_warning_phrases
 from routes import inference as inference_routes
 from routes import stt
+from routes import tts
 from routes import identity 
 
 
@@ -47,11 +50,23 @@ templates = Jinja2Templates(directory=BASE_DIR / "templates")
 
 
 # ------------------------
-# 서버 시작 시 모델 로딩
+# 서버 시작 시 모델 로딩 + warm-up
+# (백그라운드 수행, 완료 전까지 /api/ready 는 503)
 # ------------------------
+def _preload():
+    preload_models()
+
+    # 서버 TTS 활성 시 기본 경고 문장 사전 합성 (모델 로딩과 CPU 경쟁하지 않도록 준비 후)
+    warm_warning_phrases()
+
+
 @app.on_event("startup")
 async def startup_event():
-    load_models()
+    threading.Thread(
+        target=_preload,
+        name="model-preload",
+        daemon=True
+    ).start()
 
 
 # ------------------------
@@ -59,6 +74,7 @@ async def startup_event():
 # ------------------------
 app.include_router(inference_routes.router, prefix="/api", tags=["inference"])
 app.include_router(stt.router, prefix="/api", tags=["stt"])
+app.include_router(tts.router, prefix="/api", tags=["tts"])
 app.include_router(identity.router, prefix="/api/identity", tags=["identity"]) 
 
 
@@ -2,6 +2,37 @@
 
 from ultralytics import YOLO
 import logging
+import time
+
+import numpy as np
+
+
+# 공간 배치 격자: 행 (0: 먼 곳 / 1: 가까운 곳) × 열 (0: 왼쪽 / 1: 정면 / 2: 오른쪽)
+LAYOUT_ROWS = 2
+LAYOUT_COLS = 3
+LAYOUT_STRIDE = 4  # 마스크 다운샘플 간격 → 프레임당 비용 상한
+
+
+def pool_class_layout(masks, class_ids, rows=LAYOUT_ROWS, cols=LAYOUT_COLS):
+    """
+    인스턴스 마스크 → 클래스별 점유 비율 / 격자 점유율
+
+    masks: (N, H, W) 0/1 배열, class_ids: (N,)
+    return: (클래스 id 배열 (C,), 전체 비율 (C,), 격자 (C, rows, cols))
+    """
+    uniq = np.unique(class_ids)
+
+    # 같은 클래스 인스턴스 합집합 (겹친 영역 중복 집계 방지, 클래스 수만큼만 반복)
+    union = np.stack([masks[class_ids == c].any(axis=0) for c in uniq])
+    _, H, W = union.shape
+    ratios = np.count_nonzero(union, axis=(1, 2)) / (H * W)
+
+    # 격자 크기의 배수로 자른 뒤 block 평균
+    h = H // rows * rows
+    w = W // cols * cols
+    cell = (h // rows) * (w // cols)
+    grid = union[:, :h, :w].reshape(len(uniq), rows, h // rows, cols, w // cols).sum(axis=(2, 4)) / cell
+    return uniq, ratios, grid
 
 
 class EnvSegmenter:
@@ -10,6 +41,7 @@ class EnvSegmenter:
 
     - YOLO 기반 segmentation 모델 로드
     - 도로 / 보행로 등 환경 클래스를 위험·안전 영역으로 분류
+    - 마스크 기반 클래스별 점유 비율 + 방향(좌/중/우) × 거리(먼/가까운) 격자
     - dummy 모드 지원 (모델 미로드 상태)
     """
 
@@ -30,6 +62,14 @@ class EnvSegmenter:
         self.model.to(self.device)
         logging.info(f"EnvSegmenter loaded: {self.weights_path}")
 
+    def warmup(self, image, runs=1):
+        """더미 이미지 추론으로 그래프 / 커널 초기화"""
+        if self.model is None:
+            return
+
+        for _ in range(runs):
+            self.model(image, verbose=False)
+
     def predict(self, image):
         """
         Run environment segmentation.
@@ -39,7 +79,10 @@ class EnvSegmenter:
                 "env": {
                     "danger_zones": [...],
                     "safe_zones": [...],
-                    "raw_classes": [...]
+                    "raw_classes": [...],
+                    "<class>_ratio": float,
+                    "layout": {"<class>": [[먼 곳 좌, 중, 우], [가까운 곳 좌, 중, 우]]},
+                    "layout_ms": float
                 }
             }
         """
@@ -66,10 +109,39 @@ class EnvSegmenter:
 
         detected = set(classes)
 
-        return {
-            "env": {
-                "danger_zones": sorted(detected & danger_set),
-                "safe_zones": sorted(detected & safe_set),
-                "raw_classes": list(detected),
-            }
+        env = {
+            "danger_zones": sorted(detected & danger_set),
+            "safe_zones": sorted(detected & safe_set),
+            "raw_classes": list(detected),
         }
+        env.update(self._layout(results, class_ids))
+        return {"env": env}
+
+    def _layout(self, results, class_ids):
+        """클래스별 점유 비율 / 공간 격자 (마스크 없으면 빈 dict)"""
+        if results.masks is None or len(class_ids) == 0:
+            return {}
+
+        t0 = time.perf_counter()
+
+        # 마스크는 letterbox 입력 해상도 → 원본 영역만 잘라 다운샘플
+        data = results.masks.data
+        mh, mw = data.shape[1:]
+        oh, ow = results.orig_shape
+        gain = min(mh / oh, mw / ow)
+        pad_h = int(round((mh - oh * gain) / 2))
+        pad_w = int(round((mw - ow * gain) / 2))
+        data = data[:, pad_h:mh - pad_h:LAYOUT_STRIDE, pad_w:mw - pad_w:LAYOUT_STRIDE]
+        masks = data.cpu().numpy() > 0.5
+
+        uniq, ratios, grid = pool_class_layout(masks, class_ids)
+
+        names = results.names
+        out = {"layout": {}}
+        for i, cid in enumerate(uniq):
+            name = names[int(cid)]
+            out[f"{name}_ratio"] = round(float(ratios[i]), 4)
+            out["layout"][name] = np.round(grid[i], 3).tolist()
+
+        out["layout_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        return out
@@ -23,6 +23,14 @@ class ObjectDetector:
         self.model.to(self.device)
         logging.info(f"Object detector loaded: {self.weights_path}")
 
+    def warmup(self, image, runs=1):
+        """더미 이미지 추론으로 그래프 / 커널 초기화 (tracking 상태에는 영향 없음)"""
+        if self.model is None:
+            return
+
+        for _ in range(runs):
+            self.model(image, verbose=False)
+
     def predict(self, image_bgr: np.ndarray, track=False):
         if self.dummy:
             return {"objects": []}
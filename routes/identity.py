@@ -1,15 +1,22 @@
 # routes/identity.py
 
-from fastapi import APIRouter, HTTPException
+import json
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from core.location_identity import (
     get_location_summary,
+    iter_location_summary,
     get_full_address,
     get_nearest_landmark,
     get_nearest_facility,
     CATEGORIES,   # Facility code validation
 )
+from core.kakao_quota import kakao_quota
 from core.warning import warning_manager
 
 router = APIRouter()
@@ -22,12 +29,14 @@ router = APIRouter()
 class LocationRequest(BaseModel):
     lat: float = Field(..., ge=-90, le=90, description="Latitude")
     lng: float = Field(..., ge=-180, le=180, description="Longitude")
+    session_id: Optional[str] = Field(None, max_length=64, description="Client session id")
 
 
 class FacilityRequest(BaseModel):
     lat: float = Field(..., ge=-90, le=90)
     lng: float = Field(..., ge=-180, le=180)
     category_code: str = Field(..., description="Kakao category code")
+    session_id: Optional[str] = Field(None, max_length=64)
 
 
 # =======================
@@ -37,12 +46,48 @@ class FacilityRequest(BaseModel):
 @router.post("/summary")
 def location_summary(payload: LocationRequest):
     try:
-        msg = get_location_summary(payload.lat, payload.lng)
+        msg = get_location_summary(
+            payload.lat, payload.lng, payload.session_id
+        )
         return {"mode": "summary", "message": msg}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"[summary] {str(e)}")
 
 
+# =======================
+# Location summary (SSE stream)
+# =======================
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.get("/summary/stream")
+def location_summary_stream(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    session_id: Optional[str] = Query(None, max_length=64),
+):
+    """
+    위치 요약 단계별 전송 (text/event-stream)
+
+    event: region → poi → done 순서로 message 전송
+    """
+    def events():
+        try:
+            for stage, text in iter_location_summary(lat, lng, session_id):
+                yield _sse(stage, {"mode": "summary", "message": text})
+        except Exception as e:
+            logging.error(f"[summary/stream] {e}")
+            yield _sse("error", {"mode": "summary", "message": "위치 정보를 불러오지 못했습니다."})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # =======================
 # Full address
 # =======================
@@ -50,7 +95,9 @@ def location_summary(payload: LocationRequest):
 @router.post("/address")
 def location_address(payload: LocationRequest):
     try:
-        msg = get_full_address(payload.lat, payload.lng)
+        msg = get_full_address(
+            payload.lat, payload.lng, payload.session_id
+        )
         return {"mode": "address", "message": msg}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"[address] {str(e)}")
@@ -63,7 +110,9 @@ def location_address(payload: LocationRequest):
 @router.post("/landmark")
 def location_landmark(payload: LocationRequest):
     try:
-        msg = get_nearest_landmark(payload.lat, payload.lng)
+        msg = get_nearest_landmark(
+            payload.lat, payload.lng, payload.session_id
+        )
         return {"mode": "landmark", "message": msg}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"[landmark] {str(e)}")
@@ -86,7 +135,8 @@ def location_facility(payload: FacilityRequest):
         msg = get_nearest_facility(
             payload.lat,
             payload.lng,
-            payload.category_code
+            payload.category_code,
+            payload.session_id
         )
         return {
             "mode": "facility",
@@ -107,3 +157,12 @@ def identity_status():
         "active_warnings": warning_manager.get_active_warnings(),
         "environment": warning_manager.last_env
     }
+
+
+# =======================
+# Kakao quota metrics
+# =======================
+
+@router.get("/quota")
+def identity_quota():
+    return kakao_quota.metrics()
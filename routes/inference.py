@@ -1,21 +1,27 @@
 # routes/inference.py
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Body
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body
 from fastapi.responses import JSONResponse
 import numpy as np
 import cv2
 import base64
+import json
 import logging
 import time
-from collections import Counter
-
-from core.tts import build_warning_message, TTS_CLASS_MAP
-from core.model_manager import run_full_inference
+from typing import Optional
+
+from core.tts import (
+    build_warning, build_env_warning, build_env_position_message,
+    add_particle, get_direction_index, DIRECTIONS
+)
+from core.model_manager import run_full_inference, is_ready, get_startup_metrics
+from core.frame_clock import get_frame_clock
+from core.ego_motion import get_ego_motion
 from core.config import settings
-from core.risk import compute_risk, CLASS_WEIGHTS
+from core.distance import proximity_score, ranking_distance
+from core.risk import compute_frame_risk, CLASS_WEIGHTS
 from core.warning import warning_manager
-from core.env_risk import compute_env_risk
-from core.tts import get_direction, add_particle
+from core.env_risk import compute_env_risk, get_env_tracker
 
 router = APIRouter()
 
@@ -71,31 +77,102 @@ def draw_boxes(image, objects):
 # ------------------------
 def compute_priority(obj, frame_h):
     class_weight = CLASS_WEIGHTS.get(obj["class"], 0.5)
-    distance_score = obj["curr_h"] / frame_h
+    distance = ranking_distance(obj.get("distance_m"), obj.get("distance_upper_bound", False))
+    if distance is None:
+        distance_score = obj["curr_h"] / frame_h
+    else:
+        distance_score = proximity_score(distance)
     return class_weight * 2 + distance_score
 
 
+# 클라이언트 음성 큐 대기 보고 (speech_waits) 최대 처리 건수
+SPEECH_WAIT_REPORT_MAX = 16
+
+
+def parse_speech_waits(raw: Optional[str]) -> list:
+    """
+    클라이언트 음성 큐 대기 기록 (JSON 배열) → [{type, priority, queue_wait_ms, dropped}]
+    형식이 맞지 않는 항목은 버림
+    """
+    if not raw:
+        return []
+    try:
+        items = json.loads(raw)
+    except ValueError:
+        return []
+    if not isinstance(items, list):
+        return []
+
+    waits = []
+    for item in items[-SPEECH_WAIT_REPORT_MAX:]:
+        if not isinstance(item, dict):
+            continue
+        try:
+            waits.append({
+                "type": str(item.get("type", ""))[:8],
+                "priority": float(item.get("priority", 0)),
+                "queue_wait_ms": float(item["queue_wait_ms"]),
+                "dropped": bool(item.get("dropped", False)),
+            })
+        except (KeyError, TypeError, ValueError):
+            continue
+    return waits
+
+
+def _not_ready_response() -> JSONResponse:
+    """모델 로딩 / warm-up 완료 전 → 503 (클라이언트는 프레임을 건너뜀)"""
+    return JSONResponse(
+        status_code=503,
+        content={"ready": False, "message": "모델을 준비 중입니다."}
+    )
+
+
+# 환경 경고 음성 우선순위 (객체 경고 compute_priority 최소값과 동일)
+ENV_WARNING_PRIORITY = 1.0
+
+
 # ------------------------
 # 이미지 업로드 인퍼런스
 # ------------------------
 @router.post("/infer")
-async def infer_image(file: UploadFile = File(...), mode: str = "realtime"):
+async def infer_image(
+    file: UploadFile = File(...),
+    mode: str = "realtime",
+    captured_at: Optional[float] = Form(None),
+    session_id: Optional[str] = Form(None),
+    speech_waits: Optional[str] = Form(None),
+):
     print("🔥 MODE RECEIVED =", mode)
+    if not is_ready():
+        return _not_ready_response()
+
     # ==========================
     # ⏱️ Latency 측정 시작
     # ==========================
     t_start = time.perf_counter()
 
+    # 클라이언트 캡처 시각(epoch ms) → 서버 monotonic 시각 (세션별 시계 오프셋)
+    t_frame = get_frame_clock(session_id).convert(captured_at, time.monotonic())
+
     validate_file(file)
     file_bytes = await file.read()
     image_bgr = read_image(file_bytes)
     frame_h, frame_w, _ = image_bgr.shape
 
+    # --------------------------
+    # ⏱️ 카메라 이동 추정 (보행 중 흔들림 / 회전 보정)
+    # --------------------------
+    t_ego_start = time.perf_counter()
+    camera_shift = (0.0, 0.0)
+    if settings.EGO_MOTION_ENABLED and mode == "realtime":
+        camera_shift = get_ego_motion(session_id).update(image_bgr)
+    t_ego_end = time.perf_counter()
+
     # --------------------------
     # ⏱️ 모델 추론
     # --------------------------
     t_inf_start = time.perf_counter()
-    result = run_full_inference(image_bgr)
+    result = run_full_inference(image_bgr, t_frame, camera_shift)
     t_inf_end = time.perf_counter()
 
     print("✅ [DEBUG] infer() ENTERED")
@@ -105,7 +182,9 @@ async def infer_image(file: UploadFile = File(...), mode: str = "realtime"):
     if isinstance(environment, dict):
         warning_manager.last_env = environment
 
-    env_risk = compute_env_risk(environment)
+    # 세션별 구역 비율 EMA + hysteresis → 상태가 바뀐 구역만 entered / exited
+    env_tracker = get_env_tracker(session_id)
+    env_risk = env_tracker.update(environment, t_frame)
     objects = result.get("objects", [])
 
     # --------------------------
@@ -115,58 +194,70 @@ async def infer_image(file: UploadFile = File(...), mode: str = "realtime"):
 
     danger_candidates = []
 
-    for obj in objects:
-        obj_id = obj.get("id")
-        cls_name = obj.get("class")
-        prev_h = obj.get("prev_h")
-        curr_h = obj.get("curr_h")
-        prev_center = obj.get("prev_center")
-        curr_center = obj.get("curr_center")
-
-        if None in [obj_id, cls_name, prev_h, curr_h, prev_center, curr_center]:
-            continue
-
-        state = {
-            "class": cls_name,
-            "prev_h": prev_h,
-            "curr_h": curr_h,
-            "prev_center": prev_center,
-            "curr_center": curr_center,
-            "frame_w": frame_w
-        }
-
-        risk = compute_risk(state)
-        is_approaching = (
-            risk["components"]["Da"] == 1.0 and
-            risk["components"]["Ad"] > 0
+    # 프레임 내 추적 객체 위험도 (객체 수가 많을 때만 NumPy 일괄 계산)
+    tracked, risk = compute_frame_risk(objects, frame_w)
+    risk_scores = risk["risk_score"]
+    Da = risk["components"]["Da"]
+    Ad = risk["components"]["Ad"]
+
+    for i, obj in enumerate(tracked):
+        cls_name = obj["class"]
+        risk_score = float(risk_scores[i])
+        center = obj.get("curr_center")
+        center_x = center[0] if center else frame_w / 2
+        event = warning_manager.update_object(
+            obj["id"], cls_name, bool(Da[i] == 1.0 and Ad[i] > 0), obj.get("distance_m"),
+            distance_upper_bound=obj.get("distance_upper_bound", False),
+            direction=get_direction_index(center_x, frame_w),
+            height=float(obj.get("curr_h") or 0.0),
+            risk=risk_score,
         )
 
-        event = warning_manager.update_object(obj_id, cls_name, is_approaching)
-
         if event and warning_manager.should_warn(event):
             score = compute_priority(obj, frame_h)
             danger_candidates.append({
                 "cls": cls_name,
-                "center": curr_center,
-                "score": score
+                "center": obj["curr_center"],
+                "score": score,
+                "risk": risk_score,
+                # 상한값(하단이 잘린 박스)은 "약 N미터" 생략
+                "distance": None if obj.get("distance_upper_bound") else obj.get("distance_m")
             })
 
     warnings = []
+    warning_ids = []
+    warning_priorities = []  # 클라이언트 음성 큐 선점 기준 (높을수록 긴급)
 
     if danger_candidates and warning_manager.can_global_warn():
         top = sorted(danger_candidates, key=lambda x: x["score"], reverse=True)[0]
         center_x = top["center"][0] if top["center"] else frame_w / 2
-        msg = build_warning_message(top["cls"], center_x, frame_w)
+        msg_id, msg = build_warning(top["cls"], center_x, frame_w, top["distance"])
         warnings.append(msg)
-
-    if env_risk["is_danger"]:
-        for zone in env_risk["danger_zones"]:
-            if warning_manager.should_env_warn(zone):
-                label = TTS_CLASS_MAP.get(zone, zone)
-                warnings.append(f"{label} 환경입니다. 주의하세요.")
+        warning_ids.append(msg_id)
+        warning_priorities.append(round(top["score"] + top["risk"], 3))
+
+    # 환경 경고는 위험 구역 진입당 한 번 (쿨다운 / mute 로 막히면 구역 유지 중 다음 프레임에 재시도)
+    for zone in env_risk["pending"]:
+        if warning_manager.should_env_warn(zone):
+            env_tracker.mark_announced(zone)
+            msg_id, msg = build_env_warning(zone)
+            warnings.append(msg)
+            warning_ids.append(msg_id)
+            warning_priorities.append(ENV_WARNING_PRIORITY)
 
     warning_manager.cleanup()
     result["warnings"] = warnings
+    result["warning_ids"] = warning_ids
+    result["warning_priorities"] = warning_priorities
+    result["env_state"] = {
+        "danger_zones": env_risk["danger_zones"],
+        "safe_zones": env_risk["safe_zones"],
+        "current_zone": env_risk["current_zone"],
+    }
+    result["env_events"] = (
+        [{"zone": z, "event": "enter"} for z in env_risk["entered"]] +
+        [{"zone": z, "event": "exit"} for z in env_risk["exited"]]
+    )
 
     t_logic_end = time.perf_counter()
 
@@ -192,6 +283,7 @@ async def infer_image(file: UploadFile = File(...), mode: str = "realtime"):
         obj.pop("curr_center", None)
         obj.pop("prev_h", None)
         obj.pop("curr_h", None)
+        obj.pop("dt", None)
 
     # ==========================
     # ⏱️ Latency 계산
@@ -202,39 +294,58 @@ async def infer_image(file: UploadFile = File(...), mode: str = "realtime"):
         "total_ms": round((t_end - t_start) * 1000, 2),
         "inference_ms": round((t_inf_end - t_inf_start) * 1000, 2),
         "logic_ms": round((t_logic_end - t_logic_start) * 1000, 2),
+        "ego_motion_ms": round((t_ego_end - t_ego_start) * 1000, 2),
+        "env_layout_ms": environment.get("layout_ms", 0.0) if isinstance(environment, dict) else 0.0,
     }
 
     result["latency"] = latency
 
     logging.warning(f"[LATENCY] {latency}")
 
+    # 직전 응답들의 클라이언트 음성 큐 대기 (재생 시작 / 만료 폐기까지)
+    waits = parse_speech_waits(speech_waits)
+    if waits:
+        logging.warning(f"[LATENCY] speech_queue session={session_id} {waits}")
+
     return JSONResponse(content=result)
 
 
 
 # ==================================================
-# ✅ 수동 객체 안내 (거리 기준 상위 3개 + 사람형 문장)
+# ✅ 수동 객체 안내 (가까운 / 위험한 순 상위 3개 + 방향·거리)
 # ==================================================
 @router.get("/nearby_objects")
 def get_nearby_objects():
 
-    objs = warning_manager.get_all_objects()
-    if not objs:
+    # warning_manager 가 프레임마다 갱신하는 근접 순위에서 상위 3개만 조회 (요청 시 정렬 없음)
+    nearest = warning_manager.get_nearest_objects(3)
+    if not nearest:
         return {"message": "현재 근처에 감지된 객체가 없습니다.", "objects": []}
 
-    # 가까운 순 정렬 (bbox 높이 기준)
-    sorted_objs = sorted(objs, key=lambda o: o.last_seen, reverse=True)[:3]
-
-    labels = [TTS_CLASS_MAP.get(o.cls, o.cls) for o in sorted_objs]
-    count = Counter(labels)
-
     parts = []
-    for k, v in count.items():
-        unit = "명" if k == "사람" else "대"
-        parts.append(f"{k} {v}{unit}")
-
-    msg = "현재 근처에 " + ", ".join(parts) + "가 있습니다."
-    return {"message": msg, "objects": parts}
+    objects = []
+    for o in nearest:
+        direction = DIRECTIONS[o.direction]
+        if o.distance_upper_bound:
+            parts.append(f"{direction} 바로 앞 {o.label}")  # 하단이 잘린 박스 → 거리 상한값만 알 수 있음
+        elif o.distance_m is None:
+            parts.append(f"{direction} {o.label}")
+        else:
+            parts.append(f"{direction} 약 {max(1, round(o.distance_m))}미터 {o.label}")
+
+        objects.append({
+            "id": o.id,
+            "label": o.label,
+            "direction": direction,
+            "distance_m": None if o.distance_m is None else round(o.distance_m, 1),
+            "distance_upper_bound": o.distance_upper_bound,
+            "risk": round(o.risk, 3),
+        })
+
+    parts[-1] = add_particle(parts[-1])
+    msg = "가까운 순으로 " + ", ".join(parts) + " 있습니다."
+
+    return {"message": msg, "objects": objects}
 
 
 # ==================================================
@@ -254,9 +365,12 @@ def get_env_danger():
         return {"message": "현재 근처에 위험한 환경은 없습니다."}
 
     zone = danger[0]
-    direction = "정면"
-    label = add_particle(TTS_CLASS_MAP.get(zone, zone))
-    return {"message": f"현재 {direction}에 {label} 있습니다."}
+    cell = env_risk["positions"].get(zone)
+    return {
+        "message": build_env_position_message(zone, cell),
+        "zone": zone,
+        "position": cell,
+    }
 
 
 # ==================================================
@@ -276,9 +390,12 @@ def get_env_safe():
         return {"message": "현재 근처에 안전한 환경은 없습니다."}
 
     zone = safe[0]
-    direction = "정면"
-    label = add_particle(TTS_CLASS_MAP.get(zone, zone))
-    return {"message": f"현재 {direction}에 {label} 있습니다."}
+    cell = env_risk["positions"].get(zone)
+    return {
+        "message": build_env_position_message(zone, cell),
+        "zone": zone,
+        "position": cell,
+    }
 
 
 # ------------------------
@@ -289,6 +406,16 @@ def health_check():
     return {"status": "ok", "message": "Inference API is running"}
 
 
+# ------------------------
+# 준비 상태 (모델 로딩 + warm-up 완료 여부)
+# ------------------------
+@router.get("/ready")
+def readiness_check():
+    if not is_ready():
+        return _not_ready_response()
+    return {"ready": True, "startup": get_startup_metrics()}
+
+
 # ------------------------
 # 환경 경고 전체 on/off (UI 토글용)
 # ------------------------
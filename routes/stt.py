@@ -1,17 +1,47 @@
 # routes/stt.py
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from core.stt import transcribe_audio_file
+import asyncio
+import logging
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+
+from core.config import settings
+from core.model_manager import is_ready
+from core.stt import (
+    transcribe_audio_file,
+    stt_pool,
+    SttBusyError,
+    StreamingRecognizer,
+)
 
 router = APIRouter()
 
 
+def _retry_response(reason: str) -> JSONResponse:
+    """부하 초과 / 시간 초과 → 클라이언트 재시도 안내 (503 + Retry-After)"""
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(settings.STT_RETRY_AFTER_SEC)},
+        content={
+            "intent": "retry",
+            "raw": "",
+            "norm": "",
+            "reason": reason,
+            "retry_after": settings.STT_RETRY_AFTER_SEC,
+        },
+    )
+
+
 @router.post("/stt")
 async def stt_endpoint(file: UploadFile = File(...)):
     """
     업로드된 짧은 음성 파일을 STT 모델로 변환하여
     인식 결과를 반환한다.
 
+    STT는 전용 작업 풀에서 실행되어 이벤트 루프(프레임 추론)를 막지 않는다.
+    모델 준비 전 / 대기열이 가득 차거나 시간 초과 시 503 + Retry-After 를 반환한다.
+
     반환 형식:
     {
         "intent": "...",
@@ -19,13 +49,96 @@ async def stt_endpoint(file: UploadFile = File(...)):
         "norm": "..."
     }
     """
-    try:
-        audio_bytes = await file.read()
-        if not audio_bytes:
-            raise HTTPException(status_code=400, detail="Empty audio file.")
+    if not is_ready():
+        return _retry_response("not_ready")
 
-        result = transcribe_audio_file(audio_bytes, suffix=".webm")
-        return result
+    audio_bytes = await file.read()
+    if not audio_bytes:
+        raise HTTPException(status_code=400, detail="Empty audio file.")
 
+    try:
+        fut = stt_pool.submit(transcribe_audio_file, audio_bytes)
+    except SttBusyError:
+        return _retry_response("busy")
+
+    try:
+        return await asyncio.wait_for(
+            asyncio.wrap_future(fut),
+            timeout=settings.STT_TIMEOUT_SEC
+        )
+    except asyncio.TimeoutError:
+        fut.cancel()  # 아직 대기 중이면 실행 취소
+        return _retry_response("timeout")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"STT error: {e}")
+
+
+@router.websocket("/stt/stream")
+async def stt_stream(ws: WebSocket):
+    """
+    스트리밍 음성 명령 인식
+
+    - 클라이언트 → 서버: PCM16 mono 16kHz 바이너리 청크, 녹음 종료 시 텍스트 "end"
+    - 서버 → 클라이언트: {"type": "intent", "final": true, "intent": ..., "raw": ..., "norm": ...}
+      (부하 초과 시 intent = "retry")
+    - VAD로 발화 종료를 감지하고, 중간 디코딩 결과가 확실하면 즉시 응답 후 종료
+    - 중간 디코딩이 부하 초과 / 시간 초과이면 건너뜀 (retry 는 최종 디코딩 실패 시에만)
+    """
+    await ws.accept()
+    if not is_ready():
+        await ws.send_json({"type": "intent", "final": True, "intent": "retry", "raw": "", "norm": ""})
+        await ws.close()
+        return
+
+    recognizer = StreamingRecognizer()
+
+    try:
+        while True:
+            msg = await ws.receive()
+            if msg.get("type") == "websocket.disconnect":
+                return
+
+            if msg.get("bytes"):
+                action = recognizer.push(msg["bytes"])
+            elif msg.get("text") == "end":
+                action = "final"
+            else:
+                action = None
+
+            if action is None:
+                continue
+
+            try:
+                fut = stt_pool.submit(recognizer.decode)
+            except SttBusyError:
+                if action == "partial":
+                    continue
+                await ws.send_json({"type": "intent", "final": True, "intent": "retry", "raw": "", "norm": ""})
+                break
+
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.wrap_future(fut),
+                    timeout=settings.STT_TIMEOUT_SEC
+                )
+            except asyncio.TimeoutError:
+                fut.cancel()  # 아직 대기 중이면 실행 취소
+                if action == "partial":
+                    continue  # 중간 디코딩 지연 → 건너뛰고 최종 디코딩 대기
+                await ws.send_json({"type": "intent", "final": True, "intent": "retry", "raw": "", "norm": ""})
+                break
+
+            if action == "final" or recognizer.is_confident(result):
+                await ws.send_json({"type": "intent", "final": True, **result})
+                break
+
+        await ws.close()
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logging.error(f"[stt/stream] {e}")
+        try:
+            await ws.close(code=1011)
+        except Exception:
+            pass
@@ -0,0 +1,88 @@
+# routes/tts.py
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
+
+from core.tts import WARNING_MESSAGES, find_warning_message
+from core.tts_engine import get_phrase_cache
+
+router = APIRouter()
+
+CLIP_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable"}
+
+
+def _require_cache():
+    cache = get_phrase_cache()
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Server-side TTS is disabled.")
+    return cache
+
+
+@router.get("/tts/status")
+def tts_status():
+    return {"enabled": get_phrase_cache() is not None}
+
+
+@router.get("/tts/messages")
+def tts_messages():
+    """경고 message id → 문장 표 (/api/infer 의 warning_ids 와 대응)"""
+    return {"messages": list(WARNING_MESSAGES)}
+
+
+@router.get("/tts/message/{msg_id}")
+def tts_message(msg_id: int):
+    """경고 message id 로 사전 합성 클립 조회"""
+    cache = _require_cache()
+    try:
+        key = cache.get_or_synthesize_message(msg_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"TTS error: {e}")
+
+    if key is None:
+        raise HTTPException(status_code=404, detail="Unknown message id.")
+
+    return Response(
+        content=cache.get(key),
+        media_type="audio/ogg",
+        headers={**CLIP_HEADERS, "ETag": key},
+    )
+
+
+@router.get("/tts")
+def tts_synthesize(text: str = Query(..., min_length=1, max_length=200)):
+    """
+    경고 문장 음성 클립 (Ogg/Opus)
+
+    합성 대상은 경고 문장 표(WARNING_MESSAGES)로 제한한다.
+    (임의 문장 합성 → 디스크 / CPU 무제한 사용 방지, 그 외 문장은 브라우저 speechSynthesis)
+    """
+    msg_id = find_warning_message(text)
+    if msg_id is None:
+        raise HTTPException(status_code=404, detail="Unknown warning phrase.")
+
+    cache = _require_cache()
+    try:
+        key = cache.get_or_synthesize_message(msg_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"TTS error: {e}")
+
+    return Response(
+        content=cache.get(key),
+        media_type="audio/ogg",
+        headers={**CLIP_HEADERS, "ETag": key},
+    )
+
+
+@router.get("/tts/clip/{key}")
+def tts_clip(key: str):
+    """content-addressed 키로 캐시된 클립 조회"""
+    cache = _require_cache()
+    audio = cache.get(key) if key.isalnum() else None
+    if audio is None:
+        raise HTTPException(status_code=404, detail="Unknown clip.")
+
+    return Response(
+        content=audio,
+        media_type="audio/ogg",
+        headers={**CLIP_HEADERS, "ETag": key},
+    )
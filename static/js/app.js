@@ -59,7 +59,19 @@ let mediaRecorder = null;
 let audioChunks = [];
 let isRecording = false;
 
+// Streaming STT (WebSocket)
+const STT_STREAM_URL =
+  `${location.protocol === "https:" ? "wss" : "ws"}://${location.host}/api/stt/stream`;
+const STT_SAMPLE_RATE = 16000;
+let voiceStream = null;
+let voiceStreamFailed = false;  // WebSocket 연결 실패 이후 MediaRecorder + POST /api/stt 사용
+
 const API_URL = "/api/infer";
+
+// Per-tab session id (server-side location context key)
+const SESSION_ID = (window.crypto && crypto.randomUUID)
+  ? crypto.randomUUID()
+  : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
 const INTERVAL_MS = 900;
 
 // Location cache
@@ -71,33 +83,36 @@ const LOCATION_CACHE_MS = 20000;
 let apiRequestLock = false;
 let locationRequestLock = false;
 
-// Environment state
+// Environment state (진입 / 해제 판정은 서버 env_state / env_events)
 let envMuted = false;
 let currentEnvText = null;
-let lastEnvWarnTime = 0;
-let lastEnvDetectTime = 0;
-
-// Environment timing rules
-const ENV_REPEAT_IGNORE_MS = 30000;
-const ENV_WARN_INTERVAL_MS = 12000;
-const ENV_RELEASE_MS = 25000;
 
 // TTS
 let lastSpoken = "";
 let lastSpeakTime = 0;
 let speechRate = 1.1;
 
+// Server-side TTS (경고 문장 사전 합성 클립)
+let serverTts = false;
+let currentClip = null;
+
+fetch("/api/tts/status")
+  .then(r => r.json())
+  .then(d => { serverTts = !!d.enabled; })
+  .catch(() => {});
+
 
 // =======================
 // Latency Logging
 // =======================
 
-function recordLatency(tStart, tResponse, tSpeak, serverLatency) {
+function recordLatency(tStart, tResponse, tSpeak, serverLatency, queueWaitMs = null) {
   const entry = {
     timestamp: new Date().toISOString(),
     e2e_ms: (tSpeak - tStart).toFixed(2),
     network_ms: (tResponse - tStart).toFixed(2),
     client_tts_ms: (tSpeak - tResponse).toFixed(2),
+    queue_wait_ms: queueWaitMs === null ? null : queueWaitMs.toFixed(2),
     server: serverLatency || null
   };
 
@@ -105,6 +120,40 @@ function recordLatency(tStart, tResponse, tSpeak, serverLatency) {
   console.log("[LATENCY]", entry);
 }
 
+const SPEECH_WAIT_REPORT_MAX = 16;
+let pendingSpeechWaits = [];
+
+// 음성 큐 대기 시간 (재생 시작 또는 만료 폐기 시점까지)
+function recordSpeechWait(item, dropped) {
+  const tSpeak = performance.now();
+  const waitMs = tSpeak - item.enqueuedAt;
+
+  if (item.timing && !dropped) {
+    const { tStart, tResponse, server } = item.timing;
+    recordLatency(tStart, tResponse, tSpeak, server, waitMs);
+  }
+
+  const entry = {
+    timestamp: new Date().toISOString(),
+    type: item.type,
+    priority: item.priority,
+    queue_wait_ms: waitMs.toFixed(2),
+    dropped
+  };
+
+  latencyLog.push(entry);
+  console.log("[SPEECH]", entry);
+
+  // 다음 /api/infer 요청에 실어 서버 [LATENCY] 로그로 전달 (최근 N건)
+  pendingSpeechWaits.push({
+    type: item.type,
+    priority: item.priority,
+    queue_wait_ms: Math.round(waitMs),
+    dropped
+  });
+  if (pendingSpeechWaits.length > SPEECH_WAIT_REPORT_MAX) pendingSpeechWaits.shift();
+}
+
 
 // =======================
 // Network
@@ -139,33 +188,143 @@ function resetSpeechRate() {
 // Voice Recording
 // =======================
 
+function canStreamVoice() {
+  return !voiceStreamFailed &&
+    !!(window.WebSocket && (window.AudioContext || window.webkitAudioContext));
+}
+
+// Float32 (ctx sampleRate) → PCM16 mono 16kHz
+function toPcm16(input, inRate) {
+  const ratio = inRate / STT_SAMPLE_RATE;
+  const n = Math.floor(input.length / ratio);
+  const out = new Int16Array(n);
+  for (let i = 0; i < n; i++) {
+    const s = Math.max(-1, Math.min(1, input[Math.floor(i * ratio)]));
+    out[i] = s < 0 ? s * 0x8000 : s * 0x7fff;
+  }
+  return out.buffer;
+}
+
+// audioStream: startVoiceCommand 에서 받은 마이크 스트림
+// AudioContext 구성 실패 시 (예: 16kHz context ↔ 48kHz 마이크 연결 거부) 예외 → 호출자가 녹음 업로드로 전환
+function startVoiceStream(audioStream) {
+  const Ctx = window.AudioContext || window.webkitAudioContext;
+  let ctx = null;
+  let source, processor;
+  try {
+    ctx = new Ctx({ sampleRate: STT_SAMPLE_RATE });
+    source = ctx.createMediaStreamSource(audioStream);
+    processor = ctx.createScriptProcessor(2048, 1, 1);
+  } catch (e) {
+    if (ctx) ctx.close();
+    throw e;
+  }
+
+  const ws = new WebSocket(STT_STREAM_URL);
+  ws.binaryType = "arraybuffer";
+
+  let opened = false;
+  let closed = false;
+  const cleanup = (keepMic = false) => {
+    if (closed) return;
+    closed = true;
+    processor.disconnect();
+    source.disconnect();
+    if (!keepMic) audioStream.getTracks().forEach(t => t.stop());
+    ctx.close();
+    if (ws.readyState <= WebSocket.OPEN) ws.close();
+    voiceStream = null;
+    isRecording = false;
+    voiceBtn.innerText = "음성 명령";
+  };
+
+  processor.onaudioprocess = e => {
+    if (ws.readyState !== WebSocket.OPEN) return;
+    ws.send(toPcm16(e.inputBuffer.getChannelData(0), ctx.sampleRate));
+  };
+
+  ws.onmessage = e => {
+    const data = JSON.parse(e.data);
+    if (data.type !== "intent") return;
+    cleanup();
+    if (data.intent === "retry") {
+      return speak("음성 인식이 지연되고 있습니다. 잠시 후 다시 말씀해 주세요.", "sys");
+    }
+    handleIntent(data.intent || "unknown");
+  };
+
+  // 연결 자체가 실패하면 (WebSocket 미지원 서버 / 프록시) 같은 마이크로 녹음 업로드 방식 전환
+  const onFail = () => {
+    if (opened || closed) return cleanup();
+    voiceStreamFailed = true;
+    cleanup(true);
+    startVoiceRecorder(audioStream);
+  };
+
+  ws.onopen = () => { opened = true; };
+  ws.onerror = onFail;
+  ws.onclose = onFail;
+
+  source.connect(processor);
+  processor.connect(ctx.destination);
+
+  voiceStream = {
+    stop: () => ws.readyState === WebSocket.OPEN ? ws.send("end") : cleanup()
+  };
+  isRecording = true;
+  voiceBtn.innerText = "말하기 종료";
+}
+
 async function startVoiceCommand() {
+  let audioStream;
   try {
-    const audioStream = await navigator.mediaDevices.getUserMedia({ audio: true });
-    mediaRecorder = new MediaRecorder(audioStream);
-    audioChunks = [];
-    isRecording = true;
+    audioStream = await navigator.mediaDevices.getUserMedia({ audio: true });
+  } catch {
+    return speak("마이크 권한이 필요합니다.", "sys");
+  }
 
-    mediaRecorder.start();
-    voiceBtn.innerText = "말하기 종료";
+  if (canStreamVoice()) {
+    try {
+      return startVoiceStream(audioStream);
+    } catch (e) {
+      // 스트리밍 구성 실패 → 같은 마이크로 녹음 업로드 (이후 명령도 업로드 방식)
+      console.warn("[STT] streaming unavailable:", e);
+      voiceStreamFailed = true;
+    }
+  }
 
-    mediaRecorder.ondataavailable = e => {
-      if (e.data.size) audioChunks.push(e.data);
-    };
+  startVoiceRecorder(audioStream);
+}
 
-    mediaRecorder.onstop = async () => {
-      audioStream.getTracks().forEach(t => t.stop());
-      const blob = new Blob(audioChunks, { type: "audio/webm" });
-      await sendVoiceToSTT(blob);
-      isRecording = false;
-      voiceBtn.innerText = "음성 명령";
-    };
+// MediaRecorder 녹음 → 종료 시 POST /api/stt
+function startVoiceRecorder(audioStream) {
+  try {
+    mediaRecorder = new MediaRecorder(audioStream);
   } catch {
-    speak("마이크 권한이 필요합니다.", "sys");
+    audioStream.getTracks().forEach(t => t.stop());
+    return speak("이 브라우저에서는 음성 명령을 녹음할 수 없습니다.", "sys");
   }
+  audioChunks = [];
+  isRecording = true;
+
+  mediaRecorder.start();
+  voiceBtn.innerText = "말하기 종료";
+
+  mediaRecorder.ondataavailable = e => {
+    if (e.data.size) audioChunks.push(e.data);
+  };
+
+  mediaRecorder.onstop = async () => {
+    audioStream.getTracks().forEach(t => t.stop());
+    const blob = new Blob(audioChunks, { type: "audio/webm" });
+    await sendVoiceToSTT(blob);
+    isRecording = false;
+    voiceBtn.innerText = "음성 명령";
+  };
 }
 
 function stopVoiceCommand() {
+  if (voiceStream) return voiceStream.stop();
   if (mediaRecorder && isRecording) mediaRecorder.stop();
 }
 
@@ -181,6 +340,11 @@ async function sendVoiceToSTT(blob) {
   const res = await safeFetch("/api/stt", { method: "POST", body: form });
   if (!res) return;
 
+  // 서버 STT 대기열 초과 / 시간 초과 → 재시도 안내
+  if (res.status === 503) {
+    return speak("음성 인식이 지연되고 있습니다. 잠시 후 다시 말씀해 주세요.", "sys");
+  }
+
   const data = await res.json();
   handleIntent(data.intent || "unknown");
 }
@@ -235,7 +399,18 @@ function handleIntent(intent) {
 // Text-to-Speech
 // =======================
 
-function speak(text, type = "info") {
+// 음성 큐 규칙
+// - 우선순위: 유형 기본값 + 서버 긴급도 (warning_priorities)
+// - 현재 재생 중인 문장은 더 높은 우선순위만 끊을 수 있음
+// - 대기 중 유효시간이 지난 문장은 재생하지 않고 버림
+const SPEECH_PRIORITY = { warn: 100, sys: 50, info: 10 };
+const SPEECH_TTL_MS = { warn: 3000, sys: 10000, info: 30000 };
+const SPEECH_QUEUE_MAX = 8;
+
+let speechQueue = [];
+let currentSpeech = null;
+
+function speak(text, type = "info", { append = false, msgId = null, urgency = 0, timing = null } = {}) {
   if (!window.speechSynthesis || !text) return;
 
   const now = Date.now();
@@ -244,13 +419,85 @@ function speak(text, type = "info") {
   lastSpeakTime = now;
   lastSpoken = text;
 
-  const msg = new SpeechSynthesisUtterance(text);
+  const item = {
+    text,
+    type,
+    msgId,
+    timing,
+    priority: (SPEECH_PRIORITY[type] ?? SPEECH_PRIORITY.info) + urgency,
+    enqueuedAt: performance.now(),
+    expiresAt: now + (SPEECH_TTL_MS[type] ?? SPEECH_TTL_MS.info),
+  };
+
+  // append: 이어지는 문장 (스트리밍 응답) → 앞 문장 뒤에 대기
+  // 그 외: 같은 유형이면서 우선순위가 같거나 낮은 대기 문장은 새 문장으로 대체
+  if (!append) {
+    speechQueue = speechQueue.filter(q => q.type !== type || q.priority > item.priority);
+  }
+
+  // 우선순위 내림차순, 같은 우선순위는 도착 순
+  const pos = speechQueue.findIndex(q => q.priority < item.priority);
+  speechQueue.splice(pos < 0 ? speechQueue.length : pos, 0, item);
+  speechQueue.length = Math.min(speechQueue.length, SPEECH_QUEUE_MAX);
+
+  if (currentSpeech && item.priority > currentSpeech.priority) {
+    stopSpeech();
+  }
+  pumpSpeech();
+}
+
+function stopSpeech() {
+  // onend 콜백이 다음 문장을 재생하지 않도록 먼저 해제
+  currentSpeech = null;
+  speechSynthesis.cancel();
+  if (currentClip) currentClip.pause();
+}
+
+function pumpSpeech() {
+  while (!currentSpeech && speechQueue.length) {
+    const item = speechQueue.shift();
+    if (Date.now() > item.expiresAt) {
+      recordSpeechWait(item, true);
+      continue;
+    }
+    playSpeech(item);
+  }
+}
+
+function playSpeech(item) {
+  currentSpeech = item;
+  recordSpeechWait(item, false);
+
+  const done = () => {
+    if (currentSpeech !== item) return;
+    currentSpeech = null;
+    pumpSpeech();
+  };
+
+  const msg = new SpeechSynthesisUtterance(item.text);
   msg.lang = "ko-KR";
-  msg.rate = type === "warn"
+  msg.rate = item.type === "warn"
     ? Math.min(1.4, speechRate + 0.2)
     : speechRate;
+  msg.onend = done;
+  msg.onerror = done;
+
+  const fallback = () => {
+    if (currentSpeech === item) speechSynthesis.speak(msg);
+  };
+
+  // 경고 문장은 서버에서 미리 합성된 클립 재생 (실패 시 브라우저 TTS)
+  // msgId: /api/infer 의 warning_ids (서버 경고 문장 표 id), 표에 없는 문장은 speechSynthesis
+  if (serverTts && item.type === "warn" && item.msgId != null && item.msgId >= 0) {
+    const clip = new Audio(`/api/tts/message/${item.msgId}`);
+    clip.playbackRate = msg.rate / 1.1;
+    clip.onended = done;
+    clip.onerror = fallback;
+    currentClip = clip;
+    clip.play().catch(fallback);
+    return;
+  }
 
-  speechSynthesis.cancel();
   speechSynthesis.speak(msg);
 }
 
@@ -355,25 +602,33 @@ function startLoop() {
 
     canvas.width = 640;
     canvas.height = 360;
+    const capturedAt = Date.now();
     ctx.drawImage(video, 0, 0);
 
     const blob = await new Promise(r =>
       canvas.toBlob(r, "image/jpeg", 0.6)
     );
-    await sendFrame(blob);
+    await sendFrame(blob, capturedAt);
   }, INTERVAL_MS);
 }
 
-async function sendFrame(blob) {
+async function sendFrame(blob, capturedAt) {
   if (uploadMode) return;
 
   const tStart = performance.now();
   const form = new FormData();
   form.append("mode", "realtime");
   form.append("file", blob);
+  // 캡처 시각 → 서버가 실제 프레임 간격으로 위험도(TTC 초) 계산
+  form.append("captured_at", capturedAt);
+  form.append("session_id", SESSION_ID);
+  if (pendingSpeechWaits.length) {
+    form.append("speech_waits", JSON.stringify(pendingSpeechWaits));
+    pendingSpeechWaits = [];
+  }
 
   const res = await safeFetch(API_URL, { method: "POST", body: form });
-  if (!res) return;
+  if (!res || res.status === 503) return;  // 모델 준비 전 → 프레임 건너뜀
 
   const tResponse = performance.now();
   const data = await res.json();
@@ -388,41 +643,25 @@ async function sendFrame(blob) {
 function resetEnvState() {
   envMuted = false;
   currentEnvText = null;
-  lastEnvWarnTime = 0;
-  lastEnvDetectTime = 0;
   envToggleBtn.innerText = "경고 끄기";
 }
 
-function processEnv(msg) {
-  const now = Date.now();
-
-  if (!msg) {
-    if (currentEnvText && now - lastEnvDetectTime > ENV_RELEASE_MS) {
-      resetEnvState();
-    }
-    return;
-  }
-
-  lastEnvDetectTime = now;
-
-  if (currentEnvText !== msg) {
+// 서버는 위험 구역 진입 시점에만 환경 경고를 보냄 (EMA + hysteresis)
+function processEnv(msg, state, urgency = 0) {
+  if (msg) {
     currentEnvText = msg;
-    envMuted = false;
-    lastEnvWarnTime = now;
-    envToggleBtn.innerText = "경고 끄기";
+    envDiv.innerText = msg;
     alertDiv.innerText = msg;
-    speak(msg, "warn");
+    if (!envMuted) speak(msg, "warn", { urgency });
     return;
   }
 
-  if (envMuted) return;
-  if (now - lastEnvWarnTime < ENV_REPEAT_IGNORE_MS) return;
-
-  if (now - lastEnvWarnTime >= ENV_WARN_INTERVAL_MS) {
-    alertDiv.innerText = msg;
-    speak(msg, "warn");
-    lastEnvWarnTime = now;
+  // 위험 구역 해제 → 표시 / 음소거 초기화
+  if (currentEnvText && state && !state.danger_zones.length) {
+    resetEnvState();
   }
+  envDiv.innerText = currentEnvText || "-";
+  alertDiv.innerText = currentEnvText || "없음";
 }
 
 
@@ -459,18 +698,23 @@ function updateUI(data, tStart = null, tResponse = null) {
     return;
   }
 
+  const timing = tStart === null ? null : { tStart, tResponse, server: data.latency };
+
   if (data.warnings?.length) {
     const msg = data.warnings[0];
     objectsDiv.innerText = msg;
-    speak(msg, "warn");
+    speak(msg, "warn", {
+      msgId: data.warning_ids?.[0],
+      urgency: data.warning_priorities?.[0] ?? 0,
+      timing
+    });
   } else {
     objectsDiv.innerText = "-";
   }
 
-  const envMsg = data.warnings?.find(w => w.includes("환경")) || null;
-  envDiv.innerText = envMsg || "-";
-  alertDiv.innerText = envMsg || "없음";
-  processEnv(envMsg);
+  const envIdx = data.warnings?.findIndex(w => w.includes("환경")) ?? -1;
+  const envMsg = envIdx >= 0 ? data.warnings[envIdx] : null;
+  processEnv(envMsg, data.env_state, data.warning_priorities?.[envIdx] ?? 0);
 
   if (data.image) {
     if (video.srcObject) {
@@ -552,19 +796,58 @@ async function toggleEnvAlert() {
 // Location
 // =======================
 
+// Summary (SSE): region 문장을 먼저 말하고, 시설 문장을 이어서 말함
+function streamLocationSummary(lat, lng) {
+  return new Promise(resolve => {
+    const params = new URLSearchParams({ lat, lng, session_id: SESSION_ID });
+    const source = new EventSource(`/api/identity/summary/stream?${params}`);
+    let spokeFirst = false;
+
+    const finish = ok => {
+      source.close();
+      resolve(ok);
+    };
+
+    const onChunk = e => {
+      const data = JSON.parse(e.data);
+      speak(data.message, "info", { append: spokeFirst });
+      spokeFirst = true;
+    };
+
+    source.addEventListener("region", onChunk);
+    source.addEventListener("poi", onChunk);
+
+    source.addEventListener("done", e => {
+      // 검증 실패 등으로 단계 문장 없이 종료된 경우
+      if (!spokeFirst) speak(JSON.parse(e.data).message);
+      finish(true);
+    });
+
+    source.addEventListener("error", e => {
+      if (e.data) speak(JSON.parse(e.data).message, "sys");
+      finish(spokeFirst || !!e.data);
+    });
+  });
+}
+
 function fetchLocation(mode = "summary", categoryCode = null) {
   if (locationRequestLock) return;
   locationRequestLock = true;
 
   const perform = async (lat, lng) => {
+    if (mode === "summary" && window.EventSource) {
+      const ok = await streamLocationSummary(lat, lng);
+      if (ok) return;
+    }
+
     let url = "/api/identity/summary";
-    let body = { lat, lng };
+    let body = { lat, lng, session_id: SESSION_ID };
 
     if (mode === "address") url = "/api/identity/address";
     if (mode === "landmark") url = "/api/identity/landmark";
     if (mode === "facility") {
       url = "/api/identity/facility";
-      body = { lat, lng, category_code: categoryCode };
+      body = { lat, lng, category_code: categoryCode, session_id: SESSION_ID };
     }
 
     const res = await safeFetch(url, {
@@ -625,6 +908,10 @@ async function uploadImage() {
     { method: "POST", body: form }
   );
   if (!res) return;
+  if (res.status === 503) {
+    speak("모델을 준비 중입니다. 잠시 후 다시 시도해주세요.", "sys");
+    return;
+  }
 
   const data = await res.json();
   updateUI(data);